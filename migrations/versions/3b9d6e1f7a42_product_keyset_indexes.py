@@ -0,0 +1,34 @@
+"""Product listing indexes for keyset pagination
+
+Revision ID: 3b9d6e1f7a42
+Revises: c6f1a9d3b274
+Create Date: 2026-10-16 18:12:40.228614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d6e1f7a42'
+down_revision: Union[str, None] = 'c6f1a9d3b274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The category index is subsumed by its (category_id, sort_order, id) extension
+    op.drop_index('ix_products_category', table_name='products')
+    op.create_index(
+        'ix_products_category_order', 'products', ['category_id', 'sort_order', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_products_status_order', 'products', ['status', 'sort_order', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_status_order', table_name='products')
+    op.drop_index('ix_products_category_order', table_name='products')
+    op.create_index('ix_products_category', 'products', ['category_id'], unique=False)
@@ -0,0 +1,49 @@
+"""Partial indexes on active rows
+
+Revision ID: 4f1d2a7c9b3e
+Revises: 5a8e3c1d0b72
+Create Date: 2026-10-16 10:12:31.402518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1d2a7c9b3e'
+down_revision: Union[str, None] = '5a8e3c1d0b72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_categories_active', table_name='categories')
+    op.create_index(
+        'ix_categories_active', 'categories', ['is_active'], unique=False,
+        postgresql_where=sa.text('is_active')
+    )
+
+    op.drop_index('ix_attributes_active', table_name='attributes')
+    op.create_index(
+        'ix_attributes_active', 'attributes', ['is_active'], unique=False,
+        postgresql_where=sa.text('is_active')
+    )
+
+    op.drop_index('ix_products_status', table_name='products')
+    op.create_index(
+        'ix_products_status_active', 'products', ['category_id', 'sort_order'], unique=False,
+        postgresql_where=sa.text("status = 'ACTIVE'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_status_active', table_name='products')
+    op.create_index('ix_products_status', 'products', ['status'], unique=False)
+
+    op.drop_index('ix_attributes_active', table_name='attributes')
+    op.create_index('ix_attributes_active', 'attributes', ['is_active'], unique=False)
+
+    op.drop_index('ix_categories_active', table_name='categories')
+    op.create_index('ix_categories_active', 'categories', ['is_active'], unique=False)
@@ -0,0 +1,43 @@
+"""Covering unique indexes for user login lookups
+
+Revision ID: 5a8e3c1d0b72
+Revises: cba64a26646b
+Create Date: 2026-10-16 09:47:18.604418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a8e3c1d0b72'
+down_revision: Union[str, None] = 'cba64a26646b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns login and profile lookups read, answered by index-only scans
+AUTH_INCLUDE = ['is_active', 'password_hash', 'id']
+
+
+def upgrade() -> None:
+    # Uniqueness used to come from unique=True / index=True on the columns;
+    # depending on how the table was created that is a constraint or an index
+    for column in ('email', 'username'):
+        op.execute(f'ALTER TABLE users DROP CONSTRAINT IF EXISTS users_{column}_key')
+        op.execute(f'DROP INDEX IF EXISTS ix_users_{column}')
+    op.create_index(
+        'ix_users_email_auth', 'users', ['email'], unique=True,
+        postgresql_include=AUTH_INCLUDE
+    )
+    op.create_index(
+        'ix_users_username_auth', 'users', ['username'], unique=True,
+        postgresql_include=AUTH_INCLUDE
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_username_auth', table_name='users')
+    op.drop_index('ix_users_email_auth', table_name='users')
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
@@ -0,0 +1,62 @@
+"""Product attribute values as JSONB
+
+Revision ID: 6c2e8f14b9d7
+Revises: d3a9c51e7f60
+Create Date: 2026-10-16 14:26:52.083114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c2e8f14b9d7'
+down_revision: Union[str, None] = 'd3a9c51e7f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_product_attributes_value', table_name='product_attributes')
+    # Keep numbers, booleans and JSON lists typed; everything else becomes a JSON string
+    op.alter_column(
+        'product_attributes', 'value',
+        existing_type=sa.Text(),
+        type_=postgresql.JSONB(),
+        existing_nullable=False,
+        postgresql_using=(
+            "CASE"
+            " WHEN value ~ '^-?[0-9]+(\\.[0-9]+)?$' THEN to_jsonb(value::numeric)"
+            " WHEN value IN ('true', 'false') THEN to_jsonb(value::boolean)"
+            " WHEN value ~ '^\\[.*\\]$' THEN value::jsonb"
+            " ELSE to_jsonb(value)"
+            " END"
+        )
+    )
+    op.create_index(
+        'ix_product_attributes_value_gin', 'product_attributes', ['value'], unique=False,
+        postgresql_using='gin', postgresql_ops={'value': 'jsonb_path_ops'}
+    )
+    op.create_index(
+        'ix_product_attributes_value_number', 'product_attributes',
+        ['attribute_id', sa.text("((value #>> '{}')::numeric)")], unique=False,
+        postgresql_where=sa.text("jsonb_typeof(value) = 'number'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_attributes_value_number', table_name='product_attributes')
+    op.drop_index('ix_product_attributes_value_gin', table_name='product_attributes')
+    op.alter_column(
+        'product_attributes', 'value',
+        existing_type=postgresql.JSONB(),
+        type_=sa.Text(),
+        existing_nullable=False,
+        postgresql_using=(
+            "CASE WHEN jsonb_typeof(value) = 'string' THEN value #>> '{}' ELSE value::text END"
+        )
+    )
+    op.create_index('ix_product_attributes_value', 'product_attributes', ['value'], unique=False)
@@ -0,0 +1,112 @@
+"""Generated display name and trigger-maintained role names on users
+
+Revision ID: 7c1f4b9e2d36
+Revises: 8b6e0d3f5a21
+Create Date: 2026-10-16 12:18:42.082957
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1f4b9e2d36'
+down_revision: Union[str, None] = '8b6e0d3f5a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match the Computed expression of UserModel.display_name
+DISPLAY_NAME = (
+    "COALESCE(NULLIF(trim(COALESCE(first_name, '') || ' ' || COALESCE(last_name, '')), ''), username)"
+)
+
+# Trigger maintenance of users.role_names_cache; statements are issued one by one
+ROLE_NAMES_CACHE_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION refresh_user_role_names(target_user_id uuid) RETURNS void AS $$
+        UPDATE users SET role_names_cache = COALESCE(
+            (SELECT array_agg(r.name ORDER BY r.name)
+               FROM user_roles ur JOIN roles r ON r.id = ur.role_id
+              WHERE ur.user_id = target_user_id),
+            '{}'
+        )
+        WHERE id = target_user_id
+    $$ LANGUAGE sql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION user_roles_sync_role_names() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            PERFORM refresh_user_role_names(OLD.user_id);
+        ELSE
+            PERFORM refresh_user_role_names(NEW.user_id);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_user_roles_role_names
+    AFTER INSERT OR DELETE ON user_roles
+    FOR EACH ROW EXECUTE FUNCTION user_roles_sync_role_names()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION roles_sync_role_names() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_user_role_names(ur.user_id) FROM user_roles ur WHERE ur.role_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_roles_role_names
+    AFTER UPDATE OF name ON roles
+    FOR EACH ROW EXECUTE FUNCTION roles_sync_role_names()
+    """,
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('display_name', sa.String(length=201), sa.Computed(DISPLAY_NAME, persisted=True))
+    )
+    op.add_column(
+        'users',
+        sa.Column(
+            'role_names_cache', postgresql.ARRAY(sa.String(length=50)),
+            server_default='{}', nullable=False
+        )
+    )
+    op.create_index(
+        'ix_users_role_names_cache', 'users', ['role_names_cache'], unique=False,
+        postgresql_using='gin'
+    )
+    
+    # Backfill from existing assignments before the triggers take over
+    op.execute(
+        """
+        UPDATE users u SET role_names_cache = agg.names
+          FROM (SELECT ur.user_id, array_agg(r.name ORDER BY r.name) AS names
+                  FROM user_roles ur JOIN roles r ON r.id = ur.role_id
+                 GROUP BY ur.user_id) agg
+         WHERE agg.user_id = u.id
+        """
+    )
+    
+    for statement in ROLE_NAMES_CACHE_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS trg_roles_role_names ON roles')
+    op.execute('DROP TRIGGER IF EXISTS trg_user_roles_role_names ON user_roles')
+    op.execute('DROP FUNCTION IF EXISTS roles_sync_role_names()')
+    op.execute('DROP FUNCTION IF EXISTS user_roles_sync_role_names()')
+    op.execute('DROP FUNCTION IF EXISTS refresh_user_role_names(uuid)')
+    op.drop_index('ix_users_role_names_cache', table_name='users')
+    op.drop_column('users', 'role_names_cache')
+    op.drop_column('users', 'display_name')
@@ -0,0 +1,57 @@
+"""Move product images into product_images table
+
+Revision ID: 8b6e0d3f5a21
+Revises: 4f1d2a7c9b3e
+Create Date: 2026-10-16 11:03:47.915204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b6e0d3f5a21'
+down_revision: Union[str, None] = '4f1d2a7c9b3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('product_images',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('product_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('url', sa.String(length=2048), nullable=False),
+        sa.Column('sort_order', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_product_images_product', 'product_images', ['product_id', 'sort_order'], unique=False)
+
+    # Copy existing URLs, keeping their array order
+    op.execute("""
+        INSERT INTO product_images (id, product_id, url, sort_order)
+        SELECT gen_random_uuid(), products.id, image.url, image.position - 1
+        FROM products, unnest(products.images) WITH ORDINALITY AS image(url, position)
+    """)
+
+    op.drop_column('products', 'images')
+
+
+def downgrade() -> None:
+    op.add_column('products', sa.Column('images', postgresql.ARRAY(sa.String()), nullable=True))
+
+    op.execute("""
+        UPDATE products SET images = gallery.urls
+        FROM (
+            SELECT product_id, array_agg(url ORDER BY sort_order) AS urls
+            FROM product_images
+            GROUP BY product_id
+        ) AS gallery
+        WHERE products.id = gallery.product_id
+    """)
+
+    op.drop_index('ix_product_images_product', table_name='product_images')
+    op.drop_table('product_images')
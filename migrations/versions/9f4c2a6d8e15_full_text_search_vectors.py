@@ -0,0 +1,62 @@
+"""Generated tsvector columns for product and category search
+
+Revision ID: 9f4c2a6d8e15
+Revises: 3b9d6e1f7a42
+Create Date: 2026-10-16 18:41:07.553190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f4c2a6d8e15'
+down_revision: Union[str, None] = '3b9d6e1f7a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match SEARCH_CONFIG and the Computed expressions in the models
+PRODUCT_SEARCH_DOCUMENT = (
+    "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, '')"
+    " || ' ' || coalesce(short_description, '') || ' ' || coalesce(sku, ''))"
+)
+CATEGORY_SEARCH_DOCUMENT = (
+    "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, ''))"
+)
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column(
+        'products',
+        sa.Column(
+            'search_vector', postgresql.TSVECTOR(),
+            sa.Computed(PRODUCT_SEARCH_DOCUMENT, persisted=True),
+            nullable=False
+        )
+    )
+    op.create_index('ix_products_search', 'products', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_products_sku_trgm', 'products', ['sku'], unique=False,
+        postgresql_using='gin', postgresql_ops={'sku': 'gin_trgm_ops'}
+    )
+    op.add_column(
+        'categories',
+        sa.Column(
+            'search_vector', postgresql.TSVECTOR(),
+            sa.Computed(CATEGORY_SEARCH_DOCUMENT, persisted=True),
+            nullable=False
+        )
+    )
+    op.create_index('ix_categories_search', 'categories', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_categories_search', table_name='categories')
+    op.drop_column('categories', 'search_vector')
+    op.drop_index('ix_products_sku_trgm', table_name='products')
+    op.drop_index('ix_products_search', table_name='products')
+    op.drop_column('products', 'search_vector')
@@ -0,0 +1,36 @@
+"""Category paths as ltree
+
+Revision ID: a71f3c09e2b4
+Revises: b2d5e8a1c390
+Create Date: 2026-10-16 15:03:18.640271
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a71f3c09e2b4'
+down_revision: Union[str, None] = 'b2d5e8a1c390'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS ltree')
+    op.drop_index('ix_categories_path', table_name='categories')
+    op.execute('ALTER TABLE categories ALTER COLUMN path TYPE ltree USING path::ltree')
+    op.create_index('ix_categories_path_gist', 'categories', ['path'], unique=False, postgresql_using='gist')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_categories_path_gist', table_name='categories')
+    op.alter_column(
+        'categories', 'path',
+        type_=sa.String(length=500),
+        existing_nullable=False,
+        postgresql_using='path::text'
+    )
+    op.create_index('ix_categories_path', 'categories', ['path'], unique=False)
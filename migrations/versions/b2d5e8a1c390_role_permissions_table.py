@@ -0,0 +1,76 @@
+"""Permissions table and role_permissions association
+
+Revision ID: b2d5e8a1c390
+Revises: 6c2e8f14b9d7
+Create Date: 2026-10-16 14:44:05.317260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d5e8a1c390'
+down_revision: Union[str, None] = '6c2e8f14b9d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('permissions',
+        sa.Column('id', sa.SmallInteger(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_table('role_permissions',
+        sa.Column('role_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('permission_id', sa.SmallInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['permission_id'], ['permissions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['role_id'], ['roles.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('role_id', 'permission_id')
+    )
+    
+    # Carry over existing grants from the roles.permissions array
+    op.execute(
+        """
+        INSERT INTO permissions (name)
+        SELECT DISTINCT unnest(permissions) FROM roles
+        ORDER BY 1
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO role_permissions (role_id, permission_id)
+        SELECT DISTINCT r.id, p.id
+          FROM roles r
+          CROSS JOIN LATERAL unnest(r.permissions) AS granted(name)
+          JOIN permissions p ON p.name = granted.name
+        """
+    )
+    op.drop_column('roles', 'permissions')
+
+
+def downgrade() -> None:
+    op.add_column(
+        'roles',
+        sa.Column(
+            'permissions', postgresql.ARRAY(sa.String()),
+            server_default='{}', nullable=False
+        )
+    )
+    op.execute(
+        """
+        UPDATE roles r SET permissions = agg.names
+          FROM (SELECT rp.role_id, array_agg(p.name ORDER BY p.name) AS names
+                  FROM role_permissions rp JOIN permissions p ON p.id = rp.permission_id
+                 GROUP BY rp.role_id) agg
+         WHERE agg.role_id = r.id
+        """
+    )
+    op.drop_table('role_permissions')
+    op.drop_table('permissions')
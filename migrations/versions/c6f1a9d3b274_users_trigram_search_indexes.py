@@ -0,0 +1,36 @@
+"""Trigram indexes for user search
+
+Revision ID: c6f1a9d3b274
+Revises: e5b07d2a4c18
+Create Date: 2026-10-16 16:37:26.417306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f1a9d3b274'
+down_revision: Union[str, None] = 'e5b07d2a4c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns matched by ILIKE '%term%' user search
+SEARCH_COLUMNS = ('username', 'email', 'display_name')
+
+
+def upgrade() -> None:
+    # Provides the gin_trgm_ops operator class; left installed on downgrade
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        op.create_index(
+            f'ix_users_{column}_trgm', 'users', [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    for column in reversed(SEARCH_COLUMNS):
+        op.drop_index(f'ix_users_{column}_trgm', table_name='users')
@@ -0,0 +1,40 @@
+"""Store product prices as bigint minor units
+
+Revision ID: d3a9c51e7f60
+Revises: 7c1f4b9e2d36
+Create Date: 2026-10-16 13:41:07.215936
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a9c51e7f60'
+down_revision: Union[str, None] = '7c1f4b9e2d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRICE_COLUMNS = ('price', 'compare_price', 'cost_price')
+
+
+def upgrade() -> None:
+    for column in PRICE_COLUMNS:
+        op.alter_column(
+            'products', column,
+            existing_type=sa.Numeric(precision=10, scale=2),
+            type_=sa.BigInteger(),
+            postgresql_using=f'round({column} * 100)::bigint'
+        )
+
+
+def downgrade() -> None:
+    for column in PRICE_COLUMNS:
+        op.alter_column(
+            'products', column,
+            existing_type=sa.BigInteger(),
+            type_=sa.Numeric(precision=10, scale=2),
+            postgresql_using=f'({column} / 100.0)::numeric(10, 2)'
+        )
@@ -0,0 +1,91 @@
+"""Product status and attribute type as smallint codes
+
+Revision ID: e5b07d2a4c18
+Revises: a71f3c09e2b4
+Create Date: 2026-10-16 15:48:09.517302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b07d2a4c18'
+down_revision: Union[str, None] = 'a71f3c09e2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Codes match PRODUCT_STATUS_CODES / ATTRIBUTE_TYPE_CODES in the models
+PRODUCT_STATUS_TO_CODE = (
+    "CASE status::text"
+    " WHEN 'DRAFT' THEN 0 WHEN 'ACTIVE' THEN 1 WHEN 'INACTIVE' THEN 2 WHEN 'ARCHIVED' THEN 3"
+    " END::smallint"
+)
+ATTRIBUTE_TYPE_TO_CODE = (
+    "CASE type::text"
+    " WHEN 'STRING' THEN 0 WHEN 'TEXT' THEN 0"
+    " WHEN 'INTEGER' THEN 1 WHEN 'DECIMAL' THEN 1"
+    " WHEN 'BOOLEAN' THEN 2"
+    " WHEN 'SELECT' THEN 3 WHEN 'MULTISELECT' THEN 3"
+    " WHEN 'DATE' THEN 4 WHEN 'DATETIME' THEN 4"
+    " END::smallint"
+)
+
+
+def upgrade() -> None:
+    op.drop_index('ix_products_status_active', table_name='products')
+    op.alter_column(
+        'products', 'status',
+        type_=sa.SmallInteger(),
+        existing_nullable=False,
+        postgresql_using=PRODUCT_STATUS_TO_CODE
+    )
+    op.create_index(
+        'ix_products_status_active', 'products', ['category_id', 'sort_order'], unique=False,
+        postgresql_where=sa.text('status = 1')
+    )
+    op.alter_column(
+        'attributes', 'type',
+        type_=sa.SmallInteger(),
+        existing_nullable=False,
+        postgresql_using=ATTRIBUTE_TYPE_TO_CODE
+    )
+    op.execute('DROP TYPE IF EXISTS productstatus')
+    op.execute('DROP TYPE IF EXISTS attributetype')
+
+
+def downgrade() -> None:
+    product_status = sa.Enum('DRAFT', 'ACTIVE', 'INACTIVE', 'ARCHIVED', name='productstatus')
+    attribute_type = sa.Enum(
+        'STRING', 'INTEGER', 'DECIMAL', 'BOOLEAN', 'DATE', 'DATETIME', 'TEXT', 'SELECT', 'MULTISELECT',
+        name='attributetype'
+    )
+    product_status.create(op.get_bind())
+    attribute_type.create(op.get_bind())
+
+    # Lossy: the upgrade folded STRING/TEXT, INTEGER/DECIMAL, SELECT/MULTISELECT
+    # and DATE/DATETIME onto shared codes, so those attributes come back as
+    # STRING, DECIMAL, SELECT and DATE whatever they were before
+    op.alter_column(
+        'attributes', 'type',
+        type_=attribute_type,
+        existing_nullable=False,
+        postgresql_using=(
+            "(ARRAY['STRING', 'DECIMAL', 'BOOLEAN', 'SELECT', 'DATE'])[type + 1]::attributetype"
+        )
+    )
+    op.drop_index('ix_products_status_active', table_name='products')
+    op.alter_column(
+        'products', 'status',
+        type_=product_status,
+        existing_nullable=False,
+        postgresql_using=(
+            "(ARRAY['DRAFT', 'ACTIVE', 'INACTIVE', 'ARCHIVED'])[status + 1]::productstatus"
+        )
+    )
+    op.create_index(
+        'ix_products_status_active', 'products', ['category_id', 'sort_order'], unique=False,
+        postgresql_where=sa.text("status = 'ACTIVE'")
+    )
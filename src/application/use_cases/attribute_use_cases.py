@@ -165,9 +165,8 @@ class AttributeUseCases:
             return False
         
         # Check if attribute is used by any products
-        usage_count = await self._attribute_repository.get_usage_count(EntityId(attribute_id))
-        if usage_count > 0:
-            raise ValueError(f"Cannot delete attribute: it is used by {usage_count} products")
+        if await self._attribute_repository.is_in_use(EntityId(attribute_id)):
+            raise ValueError("Cannot delete attribute: it is used by products")
         
         await self._attribute_repository.delete(EntityId(attribute_id))
         return True
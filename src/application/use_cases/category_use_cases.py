@@ -2,11 +2,11 @@
 Category use cases
 """
 from typing import List, Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from ...domain.entities.category import Category
 from ...domain.repositories.category import CategoryRepository
-from ...domain.value_objects.common import Slug
+from ...domain.value_objects.common import Slug, uuid7
 from ..dtos.category_dto import CategoryCreateDTO, CategoryUpdateDTO, CategoryResponseDTO
 
 
@@ -30,7 +30,7 @@ class CategoryUseCases:
         
         # Create category entity
         category = Category(
-            id=uuid4(),
+            id=uuid7(),
             name=dto.name,
             slug=slug,
             description=dto.description,
@@ -46,8 +46,7 @@ class ProductUseCases:
             raise ValueError(f"Category with ID {product_data.category_id} not found")
         
         # Check if SKU is unique
-        existing_product = await self._product_repository.get_by_sku(SKU(product_data.sku))
-        if existing_product:
+        if await self._product_repository.exists_by_sku(SKU(product_data.sku)):
             raise ValueError(f"Product with SKU {product_data.sku} already exists")
         
         # Create product entity
@@ -71,7 +70,7 @@ class ProductUseCases:
         saved_product = await self._product_repository.create(product)
         
         # Convert to response DTO
-        return await self._product_to_response_dto(saved_product, category)
+        return self._product_to_response_dto(saved_product, category)
     
     async def get_product_by_id(self, product_id: UUID) -> Optional[ProductResponseDTO]:
         """Get product by ID"""
@@ -80,7 +79,7 @@ class ProductUseCases:
             return None
         
         category = await self._category_repository.get_by_id(product.category_id)
-        return await self._product_to_response_dto(product, category)
+        return self._product_to_response_dto(product, category)
     
     async def get_product_by_sku(self, sku: str) -> Optional[ProductResponseDTO]:
         """Get product by SKU"""
@@ -89,7 +88,7 @@ class ProductUseCases:
             return None
         
         category = await self._category_repository.get_by_id(product.category_id)
-        return await self._product_to_response_dto(product, category)
+        return self._product_to_response_dto(product, category)
     
     async def update_product(
         self, 
@@ -145,7 +144,7 @@ class ProductUseCases:
         
         # Save updated product
         updated_product = await self._product_repository.update(product)
-        return await self._product_to_response_dto(updated_product, category)
+        return self._product_to_response_dto(updated_product, category)
     
     async def delete_product(self, product_id: UUID) -> bool:
         """Delete a product"""
@@ -191,11 +190,7 @@ class ProductUseCases:
         )
         
         # Convert to response DTOs
-        product_dtos = []
-        for product in products:
-            category = await self._category_repository.get_by_id(product.category_id)
-            product_dto = await self._product_to_response_dto(product, category)
-            product_dtos.append(product_dto)
+        product_dtos = await self._products_to_response_dtos(products)
         
         # Calculate pagination info
         pages = (total + filters.size - 1) // filters.size
@@ -247,11 +242,7 @@ class ProductUseCases:
         )
         
         # Convert to response DTOs
-        product_dtos = []
-        for product in products:
-            category = await self._category_repository.get_by_id(product.category_id)
-            product_dto = await self._product_to_response_dto(product, category)
-            product_dtos.append(product_dto)
+        product_dtos = await self._products_to_response_dtos(products)
         
         # Calculate pagination info
         pages = (total + search_params.size - 1) // search_params.size
@@ -316,25 +307,30 @@ class ProductUseCases:
         include_subcategories: bool = False
     ) -> List[ProductResponseDTO]:
         """Get all products in a category"""
-        category_ids = [EntityId(category_id)]
-        
-        if include_subcategories:
-            # Get all subcategory IDs
-            subcategories = await self._category_repository.get_children(EntityId(category_id))
-            category_ids.extend([cat.id for cat in subcategories])
-        
-        products = await self._product_repository.get_by_category_ids(category_ids)
+        products = await self._product_repository.find_by_category(
+            EntityId(category_id),
+            include_descendants=include_subcategories
+        )
         
         # Convert to response DTOs
-        product_dtos = []
-        for product in products:
-            category = await self._category_repository.get_by_id(product.category_id)
-            product_dto = await self._product_to_response_dto(product, category)
-            product_dtos.append(product_dto)
+        product_dtos = await self._products_to_response_dtos(products)
         
         return product_dtos
     
-    async def _product_to_response_dto(
+    async def _products_to_response_dtos(self, products: List[Product]) -> List[ProductResponseDTO]:
+        """Convert products to response DTOs, loading each distinct category once"""
+        categories = {}
+        for product in products:
+            category_id = product.category_id.value
+            if category_id not in categories:
+                categories[category_id] = await self._category_repository.get_by_id(product.category_id)
+        
+        return [
+            self._product_to_response_dto(product, categories[product.category_id.value])
+            for product in products
+        ]
+    
+    def _product_to_response_dto(
         self, 
         product: Product, 
         category: Optional[Category] = None
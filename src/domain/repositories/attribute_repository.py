@@ -81,6 +81,16 @@ class AttributeRepository(ABC):
         """Get number of categories using this attribute"""
         pass
     
+    @abstractmethod
+    async def is_in_use(self, attribute_id: EntityId) -> bool:
+        """Check if any product uses this attribute"""
+        pass
+    
+    @abstractmethod
+    async def is_assigned_to_any_category(self, attribute_id: EntityId) -> bool:
+        """Check if any category has this attribute assigned"""
+        pass
+    
     @abstractmethod
     async def get_statistics(self) -> Dict[str, Any]:
         """Get attribute statistics"""
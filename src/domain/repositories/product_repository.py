@@ -6,6 +6,7 @@ Abstract base class for product repository implementations.
 
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any, Tuple
+from uuid import UUID
 
 from ..entities.product import Product, ProductStatus
 from ..value_objects.common import EntityId
@@ -30,6 +31,11 @@ class ProductRepository(ABC):
         """Get product by SKU"""
         pass
     
+    @abstractmethod
+    async def exists_by_sku(self, sku: SKU) -> bool:
+        """Check if product with SKU exists"""
+        pass
+    
     @abstractmethod
     async def update(self, product: Product) -> Product:
         """Update an existing product"""
@@ -59,9 +65,10 @@ class ProductRepository(ABC):
         page: int = 1,
         size: int = 20,
         sort_by: str = "relevance",
-        sort_order: str = "desc"
+        sort_order: str = "desc",
+        after: Optional[Tuple[Any, UUID]] = None
     ) -> Tuple[List[Product], int]:
-        """Advanced product search"""
+        """Advanced product search; after=(sort value, id) continues past that product"""
         pass
     
     @abstractmethod
@@ -69,6 +76,17 @@ class ProductRepository(ABC):
         """Get products by category IDs"""
         pass
     
+    @abstractmethod
+    async def find_by_category(
+        self,
+        category_id: EntityId,
+        include_descendants: bool = False,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[int, UUID]] = None
+    ) -> List[Product]:
+        """Get products in a category, optionally including all its subcategories"""
+        pass
+    
     @abstractmethod
     async def bulk_delete(self, product_ids: List[EntityId]) -> int:
         """Bulk delete products"""
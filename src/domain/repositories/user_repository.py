@@ -5,7 +5,7 @@ Defines the contract for user data persistence operations.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 from ..entities.user import User
@@ -57,6 +57,18 @@ class UserRepository(ABC):
         """List users with optional filters"""
         pass
     
+    @abstractmethod
+    async def list_users_paginated(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        is_verified: Optional[bool] = None,
+        role: Optional[str] = None
+    ) -> Tuple[List[User], int]:
+        """List users with optional filters, together with the total match count"""
+        pass
+    
     @abstractmethod
     async def count_users(
         self,
@@ -64,7 +76,10 @@ class UserRepository(ABC):
         is_verified: Optional[bool] = None,
         role: Optional[str] = None
     ) -> int:
-        """Count users with optional filters"""
+        """Count users with optional filters.
+        
+        Deprecated: use list_users_paginated when a page is fetched as well.
+        """
         pass
     
     @abstractmethod
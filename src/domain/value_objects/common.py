@@ -1,13 +1,26 @@
-from uuid import UUID, uuid4
+from uuid import UUID
 from datetime import datetime
 from typing import Optional
+import os
 import re
+import time
 from pydantic import BaseModel, Field, validator
 
 
+def uuid7() -> UUID:
+    """Time-ordered UUID (version 7): Unix millisecond timestamp followed by random bits.
+    
+    New ids sort after older ones, so primary key inserts land at the right edge of the index.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return UUID(int=value)
+
+
 class EntityId(BaseModel):
     """Base value object for entity identifiers"""
-    value: UUID = Field(default_factory=uuid4)
+    value: UUID = Field(default_factory=uuid7)
     
     def __str__(self) -> str:
         return str(self.value)
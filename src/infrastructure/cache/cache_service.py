@@ -2,17 +2,50 @@
 Generic cache service with common caching patterns
 """
 
-import hashlib
+import json
 import logging
-from typing import Any, Optional, Dict, List, Callable, TypeVar, Union
+import time
+from typing import Any, AsyncIterator, Iterable, Optional, Dict, List, Callable, TypeVar, Union
 from functools import wraps
 
+import orjson
+import xxhash
+from redis.asyncio.client import Pipeline
+from redis.exceptions import RedisError
+
 from .redis_client import RedisClient
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# Keys requested per SCAN cursor step
+SCAN_COUNT = 1000
+
+# Keys removed per UNLINK command when clearing by pattern
+UNLINK_BATCH_SIZE = 500
+
+
+def _canonical_default(value: Any) -> Any:
+    """Encode values JSON has no form for; sets are sorted for a stable order"""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return str(value)
+
+
+def _canonical(data: Any) -> bytes:
+    """Serialize data canonically (sorted keys) for hashing"""
+    return orjson.dumps(
+        data,
+        default=_canonical_default,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+
+
+def _digest(data: bytes) -> str:
+    """Short non-cryptographic hex digest used as cache key suffix"""
+    return xxhash.xxh3_64_hexdigest(data)
+
 
 class CacheService:
     """Generic cache service with common caching operations"""
@@ -29,14 +62,7 @@ class CacheService:
     
     def _hash_key(self, data: Any) -> str:
         """Create hash from data for cache key"""
-        if isinstance(data, dict):
-            # Sort dict for consistent hashing
-            sorted_items = sorted(data.items())
-            data_str = str(sorted_items)
-        else:
-            data_str = str(data)
-        
-        return hashlib.md5(data_str.encode()).hexdigest()[:16]
+        return _digest(_canonical(data))
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
@@ -57,6 +83,8 @@ class CacheService:
     async def delete(self, *keys: str) -> int:
         """Delete keys from cache"""
         cache_keys = [self._make_key(key) for key in keys]
+        if len(cache_keys) > 1:
+            return await self.redis.unlink(*cache_keys)
         return await self.redis.delete(*cache_keys)
     
     async def exists(self, key: str) -> bool:
@@ -76,22 +104,92 @@ class CacheService:
     
     async def keys(self, pattern: str = "*") -> List[str]:
         """Get keys matching pattern"""
+        return [key.decode() async for key in self.scan_raw_keys(pattern)]
+    
+    async def scan_raw_keys(self, pattern: str = "*") -> AsyncIterator[bytes]:
+        """Iterate undecoded keys matching pattern, with prefix removed"""
         cache_pattern = self._make_key(pattern)
-        keys = await self.redis.keys(cache_pattern)
-        
-        # Remove prefix from returned keys
-        if self.key_prefix:
-            prefix_len = len(self.key_prefix) + 1  # +1 for ':'
-            return [key[prefix_len:] for key in keys if key.startswith(self.key_prefix)]
+        prefix = f"{self.key_prefix}:".encode() if self.key_prefix else b""
+        prefix_len = len(prefix)
         
-        return keys
+        async for key in self.redis.scan_iter(cache_pattern, count=SCAN_COUNT):
+            if key.startswith(prefix):
+                yield key[prefix_len:]
     
     async def clear_pattern(self, pattern: str) -> int:
         """Clear all keys matching pattern"""
-        keys = await self.keys(pattern)
-        if keys:
-            return await self.delete(*keys)
-        return 0
+        return await self._clear_match(self._make_key(pattern))
+    
+    async def _clear_match(self, match: str) -> int:
+        """Clear all keys matching already prefixed pattern"""
+        try:
+            async with self.redis.pipeline() as pipe:
+                deleted = await self._queue_unlink_match(pipe, match)
+                return deleted + sum(await pipe.execute())
+        except RedisError as e:
+            logger.error(f"Error clearing pattern {match}: {e}")
+            return 0
+    
+    async def _queue_unlink_pattern(self, pipe: Pipeline, pattern: str) -> int:
+        """Queue UNLINK commands on pipeline for all keys matching pattern"""
+        return await self._queue_unlink_match(pipe, self._make_key(pattern))
+    
+    async def _queue_unlink_match(self, pipe: Pipeline, match: str) -> int:
+        """Queue UNLINK commands for keys matching prefixed pattern.
+        
+        The pipeline is flushed after every full batch so client memory stays
+        bounded; returns the number of keys removed by those intermediate flushes.
+        """
+        deleted = 0
+        batch: List[bytes] = []
+        
+        async for key in self.redis.scan_iter(match, count=SCAN_COUNT):
+            batch.append(key)
+            if len(batch) >= UNLINK_BATCH_SIZE:
+                pipe.unlink(*batch)
+                deleted += sum(await pipe.execute())
+                batch.clear()
+        
+        if batch:
+            pipe.unlink(*batch)
+        return deleted
+    
+    # Key indexes: sorted sets of cached keys scored by expiry time, counted without scanning
+    @staticmethod
+    def _queue_index(
+        pipe: Pipeline,
+        index: str,
+        keys: Iterable[str],
+        ttl: Optional[int]
+    ) -> None:
+        """Queue recording of keys in index, trimming entries that already expired"""
+        now = time.time()
+        expires_at = now + ttl if ttl else float("inf")
+        pipe.zremrangebyscore(index, "-inf", now)
+        pipe.zadd(index, dict.fromkeys(keys, expires_at))
+    
+    async def _count_indexes(self, indexes: List[str]) -> List[int]:
+        """Count live keys in each index in one round trip, dropping expired entries"""
+        now = time.time()
+        async with self.redis.pipeline() as pipe:
+            for index in indexes:
+                pipe.zremrangebyscore(index, "-inf", now)
+                pipe.zcard(index)
+            results = await pipe.execute()
+        return results[1::2]
+    
+    async def _clear_indexes(self, indexes: List[str]) -> int:
+        """Unlink every key recorded in indexes, and the indexes themselves, without scanning"""
+        async with self.redis.pipeline() as pipe:
+            for index in indexes:
+                pipe.zrange(index, 0, -1)
+            members = await pipe.execute()
+        
+        targets = list(set().union(*members, (index.encode() for index in indexes)))
+        async with self.redis.pipeline() as pipe:
+            for start in range(0, len(targets), UNLINK_BATCH_SIZE):
+                pipe.unlink(*targets[start:start + UNLINK_BATCH_SIZE])
+            return sum(await pipe.execute())
     
     async def get_or_set(
         self,
@@ -122,14 +220,14 @@ class CacheService:
     
     async def get_many(self, keys: List[str]) -> Dict[str, Any]:
         """Get multiple values from cache"""
-        result = {}
-        
-        for key in keys:
-            value = await self.get(key)
-            if value is not None:
-                result[key] = value
-        
-        return result
+        values = await self.get_bundle(keys)
+        return {key: value for key, value in zip(keys, values) if value is not None}
+    
+    async def get_bundle(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get values for keys in one MGET, in key order with None for misses"""
+        if not keys:
+            return []
+        return await self.redis.mget_json(*(self._make_key(key) for key in keys))
     
     async def set_many(
         self, 
@@ -174,7 +272,7 @@ class CacheService:
         cache_key = self._make_key(key)
         try:
             value = await self.redis.client.lpop(cache_key)
-            return value
+            return value.decode() if value is not None else None
         except Exception as e:
             logger.error(f"Error popping from list {key}: {e}")
             return None
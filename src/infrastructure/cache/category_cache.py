@@ -3,7 +3,8 @@ Category-specific caching service
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+import sys
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
 from .cache_service import CacheService
@@ -12,6 +13,22 @@ from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Page sizes used by the category listing endpoints; their first-page keys are pre-built
+_COMMON_PAGE_SIZES = (20, 50)
+
+# Upper bound for memoized unfiltered list keys
+_LIST_KEY_CACHE_SIZE = 256
+
+# Stats field -> unprefixed key prefix, checked once per scanned key
+_STATS_PREFIXES = (
+    ("categories", b"cat:"),
+    ("trees", b"tree:"),
+    ("children", b"children:"),
+    ("paths", b"path:"),
+    ("attributes", b"attrs:"),
+    ("lists", b"list:"),
+)
+
 
 class CategoryCacheService(CacheService):
     """Cache service for category operations"""
@@ -21,6 +38,23 @@ class CategoryCacheService(CacheService):
         self.ttl_category = settings.cache_ttl_categories
         self.ttl_tree = settings.cache_ttl_category_tree
         self.ttl_attributes = settings.cache_ttl_category_attributes
+        
+        # Unfiltered list keys by (page, size)
+        self._list_key_cache: Dict[Tuple[int, int], str] = {
+            (1, size): sys.intern(f"list:1:{size}:all") for size in _COMMON_PAGE_SIZES
+        }
+    
+    def _list_key(self, page: int, size: int, filters: Optional[Dict[str, Any]]) -> str:
+        """Build category list key, reusing memoized keys for unfiltered pages"""
+        if filters:
+            return f"list:{page}:{size}:{self._hash_key(filters)}"
+        
+        key = self._list_key_cache.get((page, size))
+        if key is None:
+            key = f"list:{page}:{size}:all"
+            if len(self._list_key_cache) < _LIST_KEY_CACHE_SIZE:
+                self._list_key_cache[(page, size)] = key
+        return key
     
     # Category caching
     async def get_category(self, category_id: UUID) -> Optional[Dict[str, Any]]:
@@ -119,9 +153,7 @@ class CategoryCacheService(CacheService):
         filters: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
         """Get category list from cache"""
-        filter_hash = self._hash_key(filters) if filters else "all"
-        key = f"list:{page}:{size}:{filter_hash}"
-        return await self.get(key)
+        return await self.get(self._list_key(page, size, filters))
     
     async def set_category_list(
         self,
@@ -131,8 +163,7 @@ class CategoryCacheService(CacheService):
         list_data: Dict[str, Any]
     ) -> bool:
         """Cache category list"""
-        filter_hash = self._hash_key(filters) if filters else "all"
-        key = f"list:{page}:{size}:{filter_hash}"
+        key = self._list_key(page, size, filters)
         return await self.set(key, list_data, ttl=self.ttl_tree)
     
     # Cache invalidation methods
@@ -173,21 +204,24 @@ class CategoryCacheService(CacheService):
     # Statistics and monitoring
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics for categories"""
-        all_keys = await self.keys("*")
+        counts = {name: 0 for name, _ in _STATS_PREFIXES}
+        total = 0
+        sample_key = None
         
-        stats = {
-            "total_keys": len(all_keys),
-            "categories": len([k for k in all_keys if k.startswith("cat:")]),
-            "trees": len([k for k in all_keys if k.startswith("tree:")]),
-            "children": len([k for k in all_keys if k.startswith("children:")]),
-            "paths": len([k for k in all_keys if k.startswith("path:")]),
-            "attributes": len([k for k in all_keys if k.startswith("attrs:")]),
-            "lists": len([k for k in all_keys if k.startswith("list:")]),
-        }
+        # Stream keys and count them by prefix; the key list is never materialized
+        async for key in self.scan_raw_keys("*"):
+            total += 1
+            if sample_key is None:
+                sample_key = key.decode()
+            for name, prefix in _STATS_PREFIXES:
+                if key.startswith(prefix):
+                    counts[name] += 1
+                    break
+        
+        stats: Dict[str, Any] = {"total_keys": total, **counts}
         
         # Get TTL info for some keys
-        if all_keys:
-            sample_key = all_keys[0]
+        if sample_key is not None:
             stats["sample_ttl"] = await self.ttl(sample_key)
         
         return stats
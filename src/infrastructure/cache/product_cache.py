@@ -3,15 +3,93 @@ Product-specific caching service
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+import sys
+from functools import lru_cache
+from typing import Iterable, List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
-from .cache_service import CacheService
+from redis.asyncio.client import Pipeline
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from .cache_service import CacheService, _digest
 from .redis_client import RedisClient
 from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Increments KEYS[1] and returns it together with the current value of KEYS[2];
+# KEYS[3] is the metrics stats index, where counters are recorded as never expiring
+_INCR_PAIR_SCRIPT = """
+local incremented = redis.call('INCR', KEYS[1])
+local other = redis.call('GET', KEYS[2]) or 0
+if incremented == 1 then
+    redis.call('ZADD', KEYS[3], 'inf', KEYS[1])
+end
+return {incremented, tonumber(other)}
+"""
+
+
+# Stats field -> key infix for every kind of entry kept in the product namespace.
+# Each kind has a sorted set index of its keys scored by expiry time, so stats
+# never have to scan the keyspace.
+_STATS_PREFIXES = {
+    "products": "prod",
+    "skus": "sku",
+    "lists": "list",
+    "searches": "search",
+    "categories": "cat",
+    "featured": "featured",
+    "stats": "stats",
+    "autocomplete": "autocomplete",
+    "filters": "filters",
+    "metrics": "metrics",
+}
+
+
+@lru_cache(maxsize=4096)
+def _query_digest(query: str) -> str:
+    """Short digest of normalized autocomplete query"""
+    return _digest(query.lower().encode())
+
+
+class _ProductKeys:
+    """Fully prefixed, interned key prefixes of the product namespace"""
+    
+    __slots__ = (
+        "prod", "sku", "list", "search", "cat", "featured",
+        "stats_overview", "autocomplete", "filters",
+        "index", "matches", "all_match",
+    )
+    
+    def __init__(self, key_prefix: str):
+        base = f"{key_prefix}:"
+        self.prod = sys.intern(base + "prod:")
+        self.sku = sys.intern(base + "sku:")
+        self.list = sys.intern(base + "list:")
+        self.search = sys.intern(base + "search:")
+        self.cat = sys.intern(base + "cat:")
+        self.featured = sys.intern(base + "featured:")
+        self.stats_overview = sys.intern(base + "stats:overview")
+        self.autocomplete = sys.intern(base + "autocomplete:")
+        self.filters = sys.intern(base + "filters:")
+        
+        # Stats index per entry kind, and SCAN patterns used by invalidation
+        self.index = {
+            name: sys.intern(f"{base}index:{infix}")
+            for name, infix in _STATS_PREFIXES.items()
+        }
+        self.matches = {
+            name: sys.intern(f"{base}{infix}:*")
+            for name, infix in _STATS_PREFIXES.items()
+        }
+        self.all_match = sys.intern(base + "*")
+
+
+# Entry kinds dropped wholesale when a product or a category changes
+_PRODUCT_RELATED_STATS = ("lists", "searches", "categories", "featured")
+_CATEGORY_RELATED_STATS = ("lists", "searches")
+
 
 class ProductCacheService(CacheService):
     """Cache service for product operations"""
@@ -22,38 +100,50 @@ class ProductCacheService(CacheService):
         self.ttl_list = 600  # 10 minutes for product lists
         self.ttl_search = settings.cache_ttl_search_results
         self.ttl_stats = 300  # 5 minutes for statistics
+        self._incr_pair_script: Optional[AsyncScript] = None
+        self._keys = _ProductKeys(self.key_prefix)
     
     # Product caching
+    # Products are stored as hashes with one JSON-encoded value per field
     async def get_product(self, product_id: UUID) -> Optional[Dict[str, Any]]:
         """Get product from cache"""
-        key = f"prod:{product_id}"
-        return await self.get(key)
+        return await self.redis.hgetall_json(self._keys.prod + str(product_id))
+    
+    async def get_product_field(self, product_id: UUID, field: str) -> Optional[Any]:
+        """Get single product field from cache"""
+        return await self.redis.hget_json(self._keys.prod + str(product_id), field)
     
     async def set_product(self, product_id: UUID, product_data: Dict[str, Any]) -> bool:
         """Cache product data"""
-        key = f"prod:{product_id}"
-        return await self.set(key, product_data, ttl=self.ttl_product)
+        key = self._keys.prod + str(product_id)
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                self.redis.queue_hset_json(pipe, key, product_data, ex=self.ttl_product)
+                if product_data:
+                    self._queue_track(pipe, "products", (key,), self.ttl_product)
+                await pipe.execute()
+            return True
+        except (TypeError, ValueError, RedisError) as e:
+            logger.error(f"Error caching product {product_id}: {e}")
+            return False
     
     async def delete_product(self, product_id: UUID) -> int:
         """Remove product from cache"""
-        key = f"prod:{product_id}"
-        return await self.delete(key)
+        return await self._delete_tracked("products", self._keys.prod + str(product_id))
     
     # Product by SKU caching
     async def get_product_by_sku(self, sku: str) -> Optional[Dict[str, Any]]:
         """Get product by SKU from cache"""
-        key = f"sku:{sku}"
-        return await self.get(key)
+        return await self.redis.get_json(self._keys.sku + sku)
     
     async def set_product_by_sku(self, sku: str, product_data: Dict[str, Any]) -> bool:
         """Cache product by SKU"""
-        key = f"sku:{sku}"
-        return await self.set(key, product_data, ttl=self.ttl_product)
+        key = self._keys.sku + sku
+        return await self._set_tracked("skus", key, product_data, self.ttl_product)
     
     async def delete_product_by_sku(self, sku: str) -> int:
         """Remove product by SKU from cache"""
-        key = f"sku:{sku}"
-        return await self.delete(key)
+        return await self._delete_tracked("skus", self._keys.sku + sku)
     
     # Product list caching
     async def get_product_list(
@@ -65,9 +155,8 @@ class ProductCacheService(CacheService):
         sort_order: str = "desc"
     ) -> Optional[Dict[str, Any]]:
         """Get product list from cache"""
-        filter_hash = self._hash_key(filters) if filters else "all"
-        key = f"list:{page}:{size}:{sort_by}:{sort_order}:{filter_hash}"
-        return await self.get(key)
+        key = self._list_key(page, size, filters, sort_by, sort_order)
+        return await self.redis.get_json(key)
     
     async def set_product_list(
         self,
@@ -79,9 +168,23 @@ class ProductCacheService(CacheService):
         list_data: Dict[str, Any]
     ) -> bool:
         """Cache product list"""
+        key = self._list_key(page, size, filters, sort_by, sort_order)
+        return await self._set_tracked("lists", key, list_data, self.ttl_list)
+    
+    def _list_key(
+        self,
+        page: int,
+        size: int,
+        filters: Optional[Dict[str, Any]],
+        sort_by: str,
+        sort_order: str
+    ) -> str:
+        """Build fully prefixed product list key"""
         filter_hash = self._hash_key(filters) if filters else "all"
-        key = f"list:{page}:{size}:{sort_by}:{sort_order}:{filter_hash}"
-        return await self.set(key, list_data, ttl=self.ttl_list)
+        return "".join((
+            self._keys.list, str(page), ":", str(size), ":",
+            sort_by, ":", sort_order, ":", filter_hash
+        ))
     
     # Products by category caching
     async def get_products_by_category(
@@ -90,8 +193,8 @@ class ProductCacheService(CacheService):
         include_subcategories: bool = False
     ) -> Optional[List[Dict[str, Any]]]:
         """Get products by category from cache"""
-        key = f"cat:{category_id}:subs:{include_subcategories}"
-        return await self.get(key)
+        key = "".join((self._keys.cat, str(category_id), ":subs:", str(include_subcategories)))
+        return await self.redis.get_json(key)
     
     async def set_products_by_category(
         self,
@@ -100,17 +203,18 @@ class ProductCacheService(CacheService):
         products_data: List[Dict[str, Any]]
     ) -> bool:
         """Cache products by category"""
-        key = f"cat:{category_id}:subs:{include_subcategories}"
-        return await self.set(key, products_data, ttl=self.ttl_list)
+        key = "".join((self._keys.cat, str(category_id), ":subs:", str(include_subcategories)))
+        return await self._set_tracked("categories", key, products_data, self.ttl_list)
     
     async def delete_products_by_category(self, category_id: UUID) -> int:
         """Remove products by category from cache"""
         # Delete both with and without subcategories
-        keys = [
-            f"cat:{category_id}:subs:True",
-            f"cat:{category_id}:subs:False"
-        ]
-        return await self.delete(*keys)
+        return await self._delete_tracked("categories", *self._category_keys(category_id))
+    
+    def _category_keys(self, category_id: UUID) -> Tuple[str, str]:
+        """Fully prefixed products-by-category keys for both subcategory modes"""
+        prefix = self._keys.cat + str(category_id)
+        return prefix + ":subs:True", prefix + ":subs:False"
     
     # Product search caching
     async def get_search_results(
@@ -123,17 +227,8 @@ class ProductCacheService(CacheService):
         sort_order: str = "desc"
     ) -> Optional[Dict[str, Any]]:
         """Get search results from cache"""
-        search_params = {
-            "query": query,
-            "filters": filters,
-            "page": page,
-            "size": size,
-            "sort_by": sort_by,
-            "sort_order": sort_order
-        }
-        search_hash = self._hash_key(search_params)
-        key = f"search:{search_hash}"
-        return await self.get(key)
+        search_hash = self._hash_key((query, filters, page, size, sort_by, sort_order))
+        return await self.redis.get_json(self._keys.search + search_hash)
     
     async def set_search_results(
         self,
@@ -146,36 +241,29 @@ class ProductCacheService(CacheService):
         results: Dict[str, Any]
     ) -> bool:
         """Cache search results"""
-        search_params = {
-            "query": query,
-            "filters": filters,
-            "page": page,
-            "size": size,
-            "sort_by": sort_by,
-            "sort_order": sort_order
-        }
-        search_hash = self._hash_key(search_params)
-        key = f"search:{search_hash}"
-        return await self.set(key, results, ttl=self.ttl_search)
+        search_hash = self._hash_key((query, filters, page, size, sort_by, sort_order))
+        key = self._keys.search + search_hash
+        return await self._set_tracked("searches", key, results, self.ttl_search)
     
     # Product statistics caching
     async def get_product_stats(self) -> Optional[Dict[str, Any]]:
         """Get product statistics from cache"""
-        return await self.get("stats:overview")
+        return await self.redis.get_json(self._keys.stats_overview)
     
     async def set_product_stats(self, stats_data: Dict[str, Any]) -> bool:
         """Cache product statistics"""
-        return await self.set("stats:overview", stats_data, ttl=self.ttl_stats)
+        return await self._set_tracked(
+            "stats", self._keys.stats_overview, stats_data, self.ttl_stats
+        )
     
     async def delete_product_stats(self) -> int:
         """Remove product statistics from cache"""
-        return await self.delete("stats:overview")
+        return await self._delete_tracked("stats", self._keys.stats_overview)
     
     # Featured products caching
     async def get_featured_products(self, limit: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
         """Get featured products from cache"""
-        key = f"featured:{limit or 'all'}"
-        return await self.get(key)
+        return await self.redis.get_json(self._keys.featured + str(limit or "all"))
     
     async def set_featured_products(
         self,
@@ -183,79 +271,182 @@ class ProductCacheService(CacheService):
         products_data: List[Dict[str, Any]]
     ) -> bool:
         """Cache featured products"""
-        key = f"featured:{limit or 'all'}"
-        return await self.set(key, products_data, ttl=self.ttl_list)
+        key = self._keys.featured + str(limit or "all")
+        return await self._set_tracked("featured", key, products_data, self.ttl_list)
     
     async def delete_featured_products(self) -> int:
         """Remove featured products from cache"""
-        return await self.clear_pattern("featured:*")
+        return await self._clear_tracked("featured")
     
     # Cache invalidation methods
     async def invalidate_product(self, product_id: UUID, sku: Optional[str] = None) -> None:
         """Invalidate all cache entries for a product"""
-        await self.delete_product(product_id)
-        
-        if sku:
-            await self.delete_product_by_sku(sku)
+        product_key = self._keys.prod + str(product_id)
         
-        # Clear related caches
-        await self.clear_pattern("list:*")
-        await self.clear_pattern("search:*")
-        await self.clear_pattern("cat:*")
-        await self.delete_featured_products()
-        await self.delete_product_stats()
+        try:
+            async with self.redis.pipeline() as pipe:
+                pipe.delete(product_key, self._keys.stats_overview)
+                pipe.zrem(self._keys.index["products"], product_key)
+                pipe.zrem(self._keys.index["stats"], self._keys.stats_overview)
+                if sku:
+                    pipe.delete(self._keys.sku + sku)
+                    pipe.zrem(self._keys.index["skus"], self._keys.sku + sku)
+                
+                # Clear related caches
+                await self._queue_clear_tracked(pipe, _PRODUCT_RELATED_STATS)
+                
+                await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Failed to invalidate cache for product {product_id}: {e}")
+            return
         
         logger.info(f"Invalidated cache for product {product_id}")
     
     async def invalidate_category_products(self, category_id: UUID) -> None:
         """Invalidate product caches for a category"""
-        await self.delete_products_by_category(category_id)
-        await self.clear_pattern("list:*")
-        await self.clear_pattern("search:*")
+        try:
+            async with self.redis.pipeline() as pipe:
+                category_keys = self._category_keys(category_id)
+                pipe.delete(*category_keys)
+                pipe.zrem(self._keys.index["categories"], *category_keys)
+                
+                await self._queue_clear_tracked(pipe, _CATEGORY_RELATED_STATS)
+                
+                await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Failed to invalidate product cache for category {category_id}: {e}")
+            return
         
         logger.info(f"Invalidated product cache for category {category_id}")
     
     async def invalidate_search_cache(self) -> None:
         """Invalidate all search caches"""
-        await self.clear_pattern("search:*")
+        await self._clear_tracked("searches")
         logger.info("Invalidated product search cache")
     
     async def invalidate_all(self) -> None:
         """Invalidate all product caches"""
-        await self.clear_pattern("*")
+        # The namespace-wide match covers the stats indexes as well
+        await self._clear_match(self._keys.all_match)
         logger.info("Invalidated all product caches")
     
+    # Stats index bookkeeping: one sorted set per entry kind, scored by expiry time
+    def _queue_track(
+        self,
+        pipe: Pipeline,
+        stat: str,
+        keys: Iterable[str],
+        ttl: int
+    ) -> None:
+        """Queue recording of cached keys of a kind in its stats index"""
+        self._queue_index(pipe, self._keys.index[stat], keys, ttl)
+    
+    async def _set_tracked(self, stat: str, key: str, value: Any, ttl: int) -> bool:
+        """Cache JSON value and record it in the stats index in one transaction"""
+        try:
+            payload = self.redis.serialize(value)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.set(key, payload, ex=ttl)
+                self._queue_track(pipe, stat, (key,), ttl)
+                await pipe.execute()
+            return True
+        except (TypeError, ValueError, RedisError) as e:
+            logger.error(f"Error caching key {key}: {e}")
+            return False
+    
+    async def _delete_tracked(self, stat: str, *keys: str) -> int:
+        """Remove cached keys of a kind together with their stats index entries"""
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.unlink(*keys)
+                pipe.zrem(self._keys.index[stat], *keys)
+                deleted, _ = await pipe.execute()
+            return deleted
+        except RedisError as e:
+            logger.error(f"Error deleting keys {keys}: {e}")
+            return 0
+    
+    async def _queue_clear_tracked(self, pipe: Pipeline, stats: Iterable[str]) -> int:
+        """Queue removal of every key of the given kinds and of their stats indexes"""
+        deleted = 0
+        for stat in stats:
+            deleted += await self._queue_unlink_match(pipe, self._keys.matches[stat])
+        pipe.unlink(*(self._keys.index[stat] for stat in stats))
+        return deleted
+    
+    async def _clear_tracked(self, stat: str) -> int:
+        """Remove every key of a kind and its stats index"""
+        try:
+            async with self.redis.pipeline() as pipe:
+                deleted = await self._queue_clear_tracked(pipe, (stat,))
+                results = await pipe.execute()
+            # The last result is the index UNLINK, which is not a cached entry
+            return deleted + sum(results[:-1])
+        except RedisError as e:
+            logger.error(f"Error clearing {stat} cache: {e}")
+            return 0
+    
     # Bulk operations
     async def warm_product_cache(self, products: List[Dict[str, Any]]) -> None:
         """Warm cache with product data"""
-        cache_data = {}
+        product_hashes = {}
+        sku_data = {}
         
         for product in products:
             product_id = product.get("id")
             sku = product.get("sku")
             
             if product_id:
-                cache_data[f"prod:{product_id}"] = product
+                product_hashes[self._keys.prod + str(product_id)] = product
             
             if sku:
-                cache_data[f"sku:{sku}"] = product
+                sku_data[self._keys.sku + sku] = product
+        
+        if not product_hashes and not sku_data:
+            return
         
-        if cache_data:
-            await self.set_many(cache_data, ttl=self.ttl_product)
-            logger.info(f"Warmed cache with {len(products)} products")
+        try:
+            sku_payload = {key: self.redis.serialize(value) for key, value in sku_data.items()}
+            
+            # Keys and their index entries are written in one transaction
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for key, product in product_hashes.items():
+                    self.redis.queue_hset_json(pipe, key, product, ex=self.ttl_product)
+                for key, payload in sku_payload.items():
+                    pipe.set(key, payload, ex=self.ttl_product)
+                if product_hashes:
+                    self._queue_track(pipe, "products", product_hashes, self.ttl_product)
+                if sku_payload:
+                    self._queue_track(pipe, "skus", sku_payload, self.ttl_product)
+                await pipe.execute()
+        except (TypeError, ValueError, RedisError) as e:
+            logger.error(f"Failed to warm product cache: {e}")
+            return
+        
+        logger.info(f"Warmed cache with {len(products)} products")
     
     async def preload_popular_products(self, product_ids: List[UUID]) -> None:
         """Preload popular products into cache"""
-        for product_id in product_ids:
-            if not await self.exists(f"prod:{product_id}"):
+        if not product_ids:
+            return
+        
+        try:
+            async with self.redis.pipeline() as pipe:
+                for product_id in product_ids:
+                    pipe.exists(self._keys.prod + str(product_id))
+                results = await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Failed to check popular products in cache: {e}")
+            return
+        
+        for product_id, exists in zip(product_ids, results):
+            if not exists:
                 logger.info(f"Product {product_id} not in cache, should be loaded")
     
     # Advanced search caching
     async def get_autocomplete_suggestions(self, query: str) -> Optional[List[str]]:
         """Get autocomplete suggestions from cache"""
-        query_hash = self._hash_key(query.lower())
-        key = f"autocomplete:{query_hash}"
-        return await self.get(key)
+        return await self.redis.get_json(self._keys.autocomplete + _query_digest(query))
     
     async def set_autocomplete_suggestions(
         self,
@@ -263,15 +454,13 @@ class ProductCacheService(CacheService):
         suggestions: List[str]
     ) -> bool:
         """Cache autocomplete suggestions"""
-        query_hash = self._hash_key(query.lower())
-        key = f"autocomplete:{query_hash}"
-        return await self.set(key, suggestions, ttl=3600)  # 1 hour
+        key = self._keys.autocomplete + _query_digest(query)
+        return await self._set_tracked("autocomplete", key, suggestions, 3600)  # 1 hour
     
     # Product filters caching
     async def get_available_filters(self, category_id: Optional[UUID] = None) -> Optional[Dict[str, Any]]:
         """Get available filters from cache"""
-        key = f"filters:{category_id or 'all'}"
-        return await self.get(key)
+        return await self.redis.get_json(self._keys.filters + str(category_id or "all"))
     
     async def set_available_filters(
         self,
@@ -279,32 +468,20 @@ class ProductCacheService(CacheService):
         filters_data: Dict[str, Any]
     ) -> bool:
         """Cache available filters"""
-        key = f"filters:{category_id or 'all'}"
-        return await self.set(key, filters_data, ttl=1800)  # 30 minutes
+        key = self._keys.filters + str(category_id or "all")
+        return await self._set_tracked("filters", key, filters_data, 1800)  # 30 minutes
     
     # Statistics and monitoring
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics for products"""
-        all_keys = await self.keys("*")
-        
-        stats = {
-            "total_keys": len(all_keys),
-            "products": len([k for k in all_keys if k.startswith("prod:")]),
-            "skus": len([k for k in all_keys if k.startswith("sku:")]),
-            "lists": len([k for k in all_keys if k.startswith("list:")]),
-            "searches": len([k for k in all_keys if k.startswith("search:")]),
-            "categories": len([k for k in all_keys if k.startswith("cat:")]),
-            "featured": len([k for k in all_keys if k.startswith("featured:")]),
-            "stats": len([k for k in all_keys if k.startswith("stats:")]),
-            "autocomplete": len([k for k in all_keys if k.startswith("autocomplete:")]),
-            "filters": len([k for k in all_keys if k.startswith("filters:")]),
-        }
-        
-        # Get TTL info for some keys
-        if all_keys:
-            sample_key = all_keys[0]
-            stats["sample_ttl"] = await self.ttl(sample_key)
+        try:
+            counts = await self._count_indexes(list(self._keys.index.values()))
+        except RedisError as e:
+            logger.error(f"Error reading product cache stats: {e}")
+            return {}
         
+        stats: Dict[str, Any] = {"total_keys": sum(counts)}
+        stats.update(zip(self._keys.index, counts))
         return stats
     
     # Cache warming strategies
@@ -320,18 +497,43 @@ class ProductCacheService(CacheService):
             logger.info(f"Should warm cache for category: {category_id}")
     
     # Performance monitoring
-    async def track_cache_hit(self, operation: str) -> None:
-        """Track cache hit for monitoring"""
-        await self.increment(f"metrics:hits:{operation}")
-    
-    async def track_cache_miss(self, operation: str) -> None:
-        """Track cache miss for monitoring"""
-        await self.increment(f"metrics:misses:{operation}")
+    async def _increment_pair(self, key: str, other_key: str) -> Tuple[int, int]:
+        """Atomically increment key and read other_key in one round-trip"""
+        if self._incr_pair_script is None:
+            self._incr_pair_script = self.redis.register_script(_INCR_PAIR_SCRIPT)
+        
+        try:
+            incremented, other = await self._incr_pair_script(
+                keys=[self._make_key(key), self._make_key(other_key), self._keys.index["metrics"]]
+            )
+            return int(incremented), int(other)
+        except RedisError as e:
+            logger.error(f"Error incrementing metric {key}: {e}")
+            return 0, 0
+    
+    async def track_cache_hit(self, operation: str) -> Tuple[int, int]:
+        """Track cache hit for monitoring, returning current (hits, misses)"""
+        return await self._increment_pair(
+            f"metrics:hits:{operation}",
+            f"metrics:misses:{operation}"
+        )
+    
+    async def track_cache_miss(self, operation: str) -> Tuple[int, int]:
+        """Track cache miss for monitoring, returning current (hits, misses)"""
+        misses, hits = await self._increment_pair(
+            f"metrics:misses:{operation}",
+            f"metrics:hits:{operation}"
+        )
+        return hits, misses
     
     async def get_hit_rate(self, operation: str) -> float:
         """Get cache hit rate for operation"""
-        hits = await self.get(f"metrics:hits:{operation}") or 0
-        misses = await self.get(f"metrics:misses:{operation}") or 0
+        raw_hits, raw_misses = await self.redis.mget(
+            self._make_key(f"metrics:hits:{operation}"),
+            self._make_key(f"metrics:misses:{operation}")
+        )
+        hits = int(raw_hits or 0)
+        misses = int(raw_misses or 0)
         
         total = hits + misses
         if total == 0:
@@ -2,41 +2,134 @@
 Redis client configuration and connection management
 """
 
+import asyncio
+import functools
 import json
 import logging
-from typing import Any, Optional, Union, Dict, List
-from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Tuple, Set, Type, TypeVar, Union, Dict, List, cast
 
+import orjson
 import redis.asyncio as redis
+import zstandard
 from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.commands.core import AsyncScript
 from redis.exceptions import RedisError, ConnectionError
 
 from ..config.settings import settings
 
+
+def _dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+_loads = orjson.loads
+
+
+# Serialized values larger than this are stored zstd-compressed
+COMPRESS_MIN_BYTES = 1024
+
+# Leading bytes of every zstd frame; JSON text can never start with them
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Shared zstd contexts; corrupt frames surface as ZstdError
+_compressor = zstandard.ZstdCompressor(level=3)
+_decompressor = zstandard.ZstdDecompressor()
+_DECODE_ERRORS: Tuple[Type[Exception], ...] = (ValueError, zstandard.ZstdError)
+
+
+def _compress(data: bytes) -> bytes:
+    return _compressor.compress(data) if len(data) > COMPRESS_MIN_BYTES else data
+
+
+def _decompress(data: bytes) -> bytes:
+    return _decompressor.decompress(data) if data.startswith(_ZSTD_MAGIC) else data
+
+
 logger = logging.getLogger(__name__)
 
+# Cached JSON larger than this is parsed in a worker thread to keep the event loop responsive
+LARGE_PAYLOAD_BYTES = 64 * 1024
+
+# Keys iterated by scan_iter between explicit yields to the event loop
+SCAN_YIELD_EVERY = 10_000
+
+# Sets every KEYS[i] to ARGV[i] with the shared expiry passed as the last ARGV
+_MSETEX_SCRIPT = """
+local ttl = ARGV[#KEYS + 1]
+for i = 1, #KEYS do
+    redis.call('SET', KEYS[i], ARGV[i], 'EX', ttl)
+end
+return #KEYS
+"""
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+def redis_safe(default: Any) -> Callable[[F], F]:
+    """Log RedisError raised by wrapped command and return default instead.
+    
+    A callable default is called with the command's arguments to build the value.
+    """
+    def decorator(func: F) -> F:
+        command = func.__name__.upper()
+        
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await func(*args, **kwargs)
+            except RedisError as e:
+                logger.error(f"Redis {command} error: {e}")
+                return default(*args, **kwargs) if callable(default) else default
+        
+        return cast(F, wrapper)
+    
+    return decorator
+
+
+def _not_connected(*args: Any, **kwargs: Any) -> Any:
+    """Placeholder for client commands used before connect()"""
+    raise RuntimeError("Redis client not initialized. Call connect() first.")
+
 
 class RedisClient:
     """Redis client wrapper with connection management and error handling"""
     
+    # Hot commands bound straight off the connected client, skipping the client property
+    _raw_get: Callable[..., Any]
+    _raw_mget: Callable[..., Any]
+    _raw_set: Callable[..., Any]
+    _raw_delete: Callable[..., Any]
+    _raw_unlink: Callable[..., Any]
+    _raw_exists: Callable[..., Any]
+    _raw_expire: Callable[..., Any]
+    _raw_ttl: Callable[..., Any]
+    _raw_hget: Callable[..., Any]
+    _raw_hset: Callable[..., Any]
+    _raw_hgetall: Callable[..., Any]
+    
     def __init__(self):
         self._client: Optional[Redis] = None
-        self._connection_pool: Optional[redis.ConnectionPool] = None
+        self._connection_pool: Optional[redis.BlockingConnectionPool] = None
+        self._msetex_script: Optional[AsyncScript] = None
+        self._bind_commands()
     
     async def connect(self) -> None:
         """Initialize Redis connection"""
         try:
-            # Create connection pool
-            self._connection_pool = redis.ConnectionPool(
-                host=settings.redis_host,
-                port=settings.redis_port,
-                db=settings.redis_db,
+            # Create connection pool; bursts wait for a free connection instead of failing
+            self._connection_pool = redis.BlockingConnectionPool.from_url(
+                settings.redis_url,
+                # Used unless the URL carries its own credentials
                 password=settings.redis_password,
-                decode_responses=True,
+                # Values are JSON blobs parsed straight from bytes; text replies are decoded per call
+                decode_responses=False,
                 max_connections=settings.redis_max_connections,
+                timeout=settings.redis_pool_timeout,
                 retry_on_timeout=True,
-                socket_timeout=5,
-                socket_connect_timeout=5,
+                socket_timeout=settings.redis_socket_timeout,
+                socket_connect_timeout=settings.redis_socket_connect_timeout,
+                socket_keepalive=True,
                 health_check_interval=30
             )
             
@@ -45,6 +138,7 @@ class RedisClient:
             
             # Test connection
             await self._client.ping()
+            self._bind_commands()
             logger.info("Redis connection established successfully")
             
         except ConnectionError as e:
@@ -58,8 +152,32 @@ class RedisClient:
         """Close Redis connection"""
         if self._client:
             await self._client.close()
+            self._client = None
+            self._bind_commands()
             logger.info("Redis connection closed")
     
+    def _bind_commands(self) -> None:
+        """Bind hot client commands as instance attributes for the current connection"""
+        client = self._client
+        if client is None:
+            self._raw_get = self._raw_mget = self._raw_set = _not_connected
+            self._raw_delete = self._raw_unlink = self._raw_exists = _not_connected
+            self._raw_expire = self._raw_ttl = _not_connected
+            self._raw_hget = self._raw_hset = self._raw_hgetall = _not_connected
+            return
+        
+        self._raw_get = client.get
+        self._raw_mget = client.mget
+        self._raw_set = client.set
+        self._raw_delete = client.delete
+        self._raw_unlink = client.unlink
+        self._raw_exists = client.exists
+        self._raw_expire = client.expire
+        self._raw_ttl = client.ttl
+        self._raw_hget = client.hget
+        self._raw_hset = client.hset
+        self._raw_hgetall = client.hgetall
+    
     @property
     def client(self) -> Redis:
         """Get Redis client instance"""
@@ -77,86 +195,119 @@ class RedisClient:
         except RedisError:
             return False
     
-    async def get(self, key: str) -> Optional[str]:
+    @redis_safe(None)
+    async def get(self, key: str) -> Optional[bytes]:
         """Get value by key"""
-        try:
-            return await self.client.get(key)
-        except RedisError as e:
-            logger.error(f"Redis GET error for key {key}: {e}")
-            return None
+        return await self._raw_get(key)
     
+    @redis_safe(lambda self, *keys: [None] * len(keys))
+    async def mget(self, *keys: str) -> List[Optional[bytes]]:
+        """Get values of several keys in one round trip"""
+        return await self._raw_mget(*keys)
+    
+    @redis_safe(False)
     async def set(
         self, 
         key: str, 
-        value: str, 
+        value: Union[str, bytes], 
         ex: Optional[int] = None,
         nx: bool = False
     ) -> bool:
         """Set key-value pair with optional expiration"""
-        try:
-            return await self.client.set(key, value, ex=ex, nx=nx)
-        except RedisError as e:
-            logger.error(f"Redis SET error for key {key}: {e}")
-            return False
+        return await self._raw_set(key, value, ex=ex, nx=nx)
+    
+    @redis_safe(False)
+    async def msetex(self, mapping: Dict[str, Union[str, bytes]], ttl: int) -> bool:
+        """Set several keys sharing one expiration in a single script call"""
+        if not mapping:
+            return True
+        if self._msetex_script is None:
+            self._msetex_script = self.register_script(_MSETEX_SCRIPT)
+        
+        await self._msetex_script(keys=list(mapping), args=[*mapping.values(), ttl])
+        return True
     
+    @redis_safe(0)
     async def delete(self, *keys: str) -> int:
         """Delete one or more keys"""
-        try:
-            return await self.client.delete(*keys)
-        except RedisError as e:
-            logger.error(f"Redis DELETE error for keys {keys}: {e}")
-            return 0
+        return await self._raw_delete(*keys)
+    
+    @redis_safe(0)
+    async def unlink(self, *keys: str) -> int:
+        """Delete one or more keys, reclaiming memory in background"""
+        return await self._raw_unlink(*keys)
     
+    @redis_safe(False)
     async def exists(self, key: str) -> bool:
         """Check if key exists"""
-        try:
-            return bool(await self.client.exists(key))
-        except RedisError as e:
-            logger.error(f"Redis EXISTS error for key {key}: {e}")
-            return False
+        return bool(await self._raw_exists(key))
     
+    @redis_safe(False)
     async def expire(self, key: str, seconds: int) -> bool:
         """Set expiration time for key"""
-        try:
-            return await self.client.expire(key, seconds)
-        except RedisError as e:
-            logger.error(f"Redis EXPIRE error for key {key}: {e}")
-            return False
+        return await self._raw_expire(key, seconds)
     
+    @redis_safe(-1)
     async def ttl(self, key: str) -> int:
         """Get time to live for key"""
-        try:
-            return await self.client.ttl(key)
-        except RedisError as e:
-            logger.error(f"Redis TTL error for key {key}: {e}")
-            return -1
+        return await self._raw_ttl(key)
     
     async def keys(self, pattern: str = "*") -> List[str]:
-        """Get keys matching pattern"""
+        """Get keys matching pattern, collected with SCAN instead of blocking KEYS"""
+        return [key.decode() async for key in self.scan_iter(pattern)]
+    
+    def pipeline(self, transaction: bool = False) -> Pipeline:
+        """Create command pipeline, non-transactional by default"""
+        return self.client.pipeline(transaction=transaction)
+    
+    def register_script(self, script: str) -> AsyncScript:
+        """Register Lua script, executed via EVALSHA with the SHA cached server-side"""
+        return self.client.register_script(script)
+    
+    async def scan_iter(self, match: str = "*", count: int = 1000) -> AsyncIterator[bytes]:
+        """Iterate raw keys matching pattern using incremental SCAN"""
         try:
-            return await self.client.keys(pattern)
+            seen = 0
+            async for key in self.client.scan_iter(match=match, count=count):
+                yield key
+                seen += 1
+                # Buffered replies resume without suspending; let other tasks run
+                if seen % SCAN_YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
         except RedisError as e:
-            logger.error(f"Redis KEYS error for pattern {pattern}: {e}")
-            return []
+            logger.error(f"Redis SCAN error for pattern {match}: {e}")
     
+    @redis_safe(False)
     async def flushdb(self) -> bool:
         """Clear current database"""
-        try:
-            await self.client.flushdb()
-            return True
-        except RedisError as e:
-            logger.error(f"Redis FLUSHDB error: {e}")
-            return False
+        await self.client.flushdb()
+        return True
     
     # JSON operations
+    @staticmethod
+    def serialize(value: Any) -> bytes:
+        """Serialize value to JSON bytes for storage, compressing large payloads"""
+        return _compress(_dumps(value))
+    
     async def get_json(self, key: str) -> Optional[Any]:
         """Get and deserialize JSON value"""
+        return await self._decode_json(key, await self.get(key))
+    
+    async def mget_json(self, *keys: str) -> List[Optional[Any]]:
+        """Get and deserialize several JSON values in one round trip"""
+        values = await self.mget(*keys)
+        return [await self._decode_json(key, value) for key, value in zip(keys, values)]
+    
+    async def _decode_json(self, key: str, value: Optional[bytes]) -> Optional[Any]:
+        """Deserialize stored JSON, parsing large payloads off the event loop"""
+        if value is None:
+            return None
         try:
-            value = await self.get(key)
-            if value is None:
-                return None
-            return json.loads(value)
-        except (json.JSONDecodeError, RedisError) as e:
+            value = _decompress(value)
+            if len(value) > LARGE_PAYLOAD_BYTES:
+                return await asyncio.to_thread(_loads, value)
+            return _loads(value)
+        except _DECODE_ERRORS as e:
             logger.error(f"Redis GET_JSON error for key {key}: {e}")
             return None
     
@@ -169,78 +320,102 @@ class RedisClient:
     ) -> bool:
         """Serialize and set JSON value"""
         try:
-            json_value = json.dumps(value, default=str)
+            json_value = self.serialize(value)
             return await self.set(key, json_value, ex=ex, nx=nx)
-        except (json.JSONEncodeError, RedisError) as e:
+        except (TypeError, ValueError, RedisError) as e:
             logger.error(f"Redis SET_JSON error for key {key}: {e}")
             return False
     
     # Hash operations
+    @redis_safe(None)
     async def hget(self, name: str, key: str) -> Optional[str]:
         """Get hash field value"""
-        try:
-            return await self.client.hget(name, key)
-        except RedisError as e:
-            logger.error(f"Redis HGET error for {name}.{key}: {e}")
-            return None
+        value = await self._raw_hget(name, key)
+        return value.decode() if value is not None else None
     
+    @redis_safe(False)
     async def hset(self, name: str, key: str, value: str) -> bool:
         """Set hash field value"""
-        try:
-            return bool(await self.client.hset(name, key, value))
-        except RedisError as e:
-            logger.error(f"Redis HSET error for {name}.{key}: {e}")
-            return False
+        return bool(await self._raw_hset(name, key, value))
     
+    @redis_safe(lambda self, name: {})
     async def hgetall(self, name: str) -> Dict[str, str]:
         """Get all hash fields"""
+        data = await self._raw_hgetall(name)
+        return {field.decode(): value.decode() for field, value in data.items()}
+    
+    def queue_hset_json(
+        self,
+        pipe: Pipeline,
+        name: str,
+        mapping: Dict[str, Any],
+        ex: Optional[int] = None
+    ) -> None:
+        """Queue commands replacing hash with JSON-encoded fields"""
+        fields = {str(field): _dumps(value) for field, value in mapping.items()}
+        
+        # Drop the old hash so fields missing from the new mapping do not linger
+        pipe.delete(name)
+        if fields:
+            pipe.hset(name, mapping=fields)
+            if ex is not None:
+                pipe.expire(name, ex)
+    
+    async def hgetall_json(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get all hash fields decoded from JSON, None if hash does not exist"""
         try:
-            return await self.client.hgetall(name)
-        except RedisError as e:
-            logger.error(f"Redis HGETALL error for {name}: {e}")
-            return {}
+            data = await self._raw_hgetall(name)
+            if not data:
+                return None
+            return {field.decode(): _loads(value) for field, value in data.items()}
+        except (json.JSONDecodeError, RedisError) as e:
+            logger.error(f"Redis HGETALL_JSON error for {name}: {e}")
+            return None
     
+    async def hget_json(self, name: str, key: str) -> Optional[Any]:
+        """Get hash field decoded from JSON"""
+        try:
+            value = await self._raw_hget(name, key)
+            if value is None:
+                return None
+            return _loads(value)
+        except (json.JSONDecodeError, RedisError) as e:
+            logger.error(f"Redis HGET_JSON error for {name}.{key}: {e}")
+            return None
+    
+    @redis_safe(0)
     async def hdel(self, name: str, *keys: str) -> int:
         """Delete hash fields"""
-        try:
-            return await self.client.hdel(name, *keys)
-        except RedisError as e:
-            logger.error(f"Redis HDEL error for {name}: {e}")
-            return 0
+        return await self.client.hdel(name, *keys)
     
     # List operations
+    @redis_safe(0)
     async def lpush(self, name: str, *values: str) -> int:
         """Push values to list head"""
-        try:
-            return await self.client.lpush(name, *values)
-        except RedisError as e:
-            logger.error(f"Redis LPUSH error for {name}: {e}")
-            return 0
+        return await self.client.lpush(name, *values)
     
+    @redis_safe(0)
     async def rpush(self, name: str, *values: str) -> int:
         """Push values to list tail"""
-        try:
-            return await self.client.rpush(name, *values)
-        except RedisError as e:
-            logger.error(f"Redis RPUSH error for {name}: {e}")
-            return 0
+        return await self.client.rpush(name, *values)
     
+    @redis_safe(lambda self, name, start, end: [])
     async def lrange(self, name: str, start: int, end: int) -> List[str]:
         """Get list range"""
-        try:
-            return await self.client.lrange(name, start, end)
-        except RedisError as e:
-            logger.error(f"Redis LRANGE error for {name}: {e}")
-            return []
+        return [value.decode() for value in await self.client.lrange(name, start, end)]
     
+    @redis_safe(False)
     async def ltrim(self, name: str, start: int, end: int) -> bool:
         """Trim list to range"""
-        try:
-            await self.client.ltrim(name, start, end)
-            return True
-        except RedisError as e:
-            logger.error(f"Redis LTRIM error for {name}: {e}")
-            return False
+        await self.client.ltrim(name, start, end)
+        return True
+    
+    # Set operations
+    @redis_safe(lambda self, name: set())
+    async def smembers(self, name: str) -> Set[str]:
+        """Get all set members"""
+        members = await cast(Awaitable[Set[bytes]], self.client.smembers(name))
+        return {member.decode() for member in members}
 
 
 # Global Redis client instance
@@ -264,15 +439,4 @@ async def close_redis_client() -> None:
     
     if _redis_client:
         await _redis_client.disconnect()
-        _redis_client = None
-
-
-@asynccontextmanager
-async def redis_client():
-    """Context manager for Redis client"""
-    client = await get_redis_client()
-    try:
-        yield client
-    finally:
-        # Connection is managed globally, don't close here
-        pass
\ No newline at end of file
+        _redis_client = None
\ No newline at end of file
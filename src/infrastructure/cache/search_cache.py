@@ -3,15 +3,103 @@ Search-specific caching service
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+import sys
+import time
+from functools import lru_cache
+from typing import Iterable, List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
+from cachetools import TTLCache
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
 from .cache_service import CacheService
 from .redis_client import RedisClient
 from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Entry kinds reported by get_cache_stats; each entity type keeps one key index per kind
+_STATS_CATEGORIES = (
+    "results", "autocomplete", "suggestions", "filters", "facets",
+    "analytics", "performance", "popular", "trending",
+)
+
+# Set of entity types that have had entries cached
+_ENTITY_TYPES_KEY = "index:entity_types"
+
+# Entries written per pipeline flush when warming
+_WARM_BATCH_SIZE = 1000
+
+# Hash of version tokens per "<entity_type>:<kind>"; replacing a token invalidates that kind
+_VERSIONS_KEY = "versions"
+
+# Small read-mostly kinds served from the in-process cache, keyed by version
+_VERSIONED_CATEGORIES = ("autocomplete", "suggestions", "filters")
+
+# In-process cache size and lifetime (seconds)
+_LOCAL_CACHE_SIZE = 10_000
+_LOCAL_CACHE_TTL = 60
+
+# Seconds a loaded set of versions is trusted before it is re-read from Redis
+_VERSIONS_REFRESH = 1.0
+
+# Records query ARGV[1] of entity type ARGV[2]: bumps its score in the all-time
+# popularity sorted set KEYS[1], pushes it onto the capped recent list KEYS[2]
+# and bumps it in the hourly and daily trending buckets KEYS[3] and KEYS[4],
+# which expire at ARGV[3] and ARGV[4]. KEYS[5..7] are the analytics, popular
+# and trending indexes, KEYS[8] the set of entity types seen.
+_TRACK_QUERY_SCRIPT = """
+redis.call('ZINCRBY', KEYS[1], 1, ARGV[1])
+redis.call('LPUSH', KEYS[2], ARGV[1])
+redis.call('LTRIM', KEYS[2], 0, 999)
+redis.call('ZINCRBY', KEYS[3], 1, ARGV[1])
+redis.call('EXPIREAT', KEYS[3], ARGV[3])
+redis.call('ZINCRBY', KEYS[4], 1, ARGV[1])
+redis.call('EXPIREAT', KEYS[4], ARGV[4])
+redis.call('ZADD', KEYS[5], 'NX', 'inf', KEYS[2])
+redis.call('ZADD', KEYS[6], 'NX', 'inf', KEYS[1])
+redis.call('ZADD', KEYS[7], 'NX', ARGV[3], KEYS[3], ARGV[4], KEYS[4])
+redis.call('SADD', KEYS[8], ARGV[2])
+return 1
+"""
+
+# Trending period -> bucket length in seconds. Queries are counted per bucket;
+# a bucket lives one period past its end so reads can blend it in, decayed.
+_TRENDING_PERIODS = {"hour": 3600, "day": 86400}
+
+# Entity types the search cache accepts; anything else would only create orphan keys
+_ENTITY_TYPES = frozenset(map(sys.intern, ("products", "categories", "attributes")))
+
+
+@lru_cache(maxsize=4096)
+def _normalize_query(query: str) -> str:
+    """Case-insensitive, whitespace-trimmed form of search query"""
+    return query.casefold().strip()
+
+
+def _check_entity_type(entity_type: str) -> None:
+    """Reject entity types the search cache does not know"""
+    if entity_type not in _ENTITY_TYPES:
+        raise ValueError(f"Unknown search entity type: {entity_type!r}")
+
+
+class _EntityKeyPrefixes(dict):
+    """Fully prefixed, interned "<prefix>:<entity_type>:<kind>:" per entity type"""
+    
+    __slots__ = ()
+    
+    def __init__(self, key_prefix: str, kind: str):
+        super().__init__(
+            (entity_type, sys.intern(f"{key_prefix}:{entity_type}:{kind}:"))
+            for entity_type in _ENTITY_TYPES
+        )
+    
+    def __missing__(self, entity_type: str) -> str:
+        # Only reached for entity types outside _ENTITY_TYPES
+        _check_entity_type(entity_type)
+        raise KeyError(entity_type)
+
 
 class SearchCacheService(CacheService):
     """Cache service for search operations"""
@@ -22,6 +110,176 @@ class SearchCacheService(CacheService):
         self.ttl_autocomplete = 3600  # 1 hour for autocomplete
         self.ttl_suggestions = 1800   # 30 minutes for suggestions
         self.ttl_filters = 1800       # 30 minutes for filter options
+        
+        # Local tier in front of Redis for versioned kinds: (key, version) -> value
+        self._local: TTLCache = TTLCache(maxsize=_LOCAL_CACHE_SIZE, ttl=_LOCAL_CACHE_TTL)
+        self._versions: Dict[str, str] = {}
+        self._versions_loaded_at = float("-inf")
+        self._track_query_script: Optional[AsyncScript] = None
+        
+        # Key prefixes of the hot entry kinds, so lookups skip per-call formatting
+        self._k_results = _EntityKeyPrefixes(self.key_prefix, "results")
+        self._k_auto = _EntityKeyPrefixes(self.key_prefix, "autocomplete")
+        self._k_suggestions = _EntityKeyPrefixes(self.key_prefix, "suggestions")
+        self._k_filters = _EntityKeyPrefixes(self.key_prefix, "filters")
+        self._k_facets = _EntityKeyPrefixes(self.key_prefix, "facets")
+    
+    # Key index bookkeeping, so stats never scan the keyspace
+    @staticmethod
+    def _index_key(entity_type: str, category: str) -> str:
+        """Unprefixed key index name for entity type and entry kind"""
+        return f"index:{entity_type}:{category}"
+    
+    def _index_keys(self, entity_type: str, categories: Tuple[str, ...]) -> List[str]:
+        """Unprefixed key index names for entity type and several entry kinds"""
+        return [self._index_key(entity_type, category) for category in categories]
+    
+    async def _set_tracked(
+        self,
+        entity_type: str,
+        category: str,
+        key: str,
+        value: Any,
+        ttl: int
+    ) -> bool:
+        """Cache JSON value under prefixed key and record it in its key index in one transaction"""
+        return await self._set_tracked_many(entity_type, ((category, key, value),), ttl)
+    
+    async def _set_tracked_many(
+        self,
+        entity_type: str,
+        entries: Iterable[Tuple[str, str, Any]],
+        ttl: int
+    ) -> bool:
+        """Cache (kind, prefixed key, value) entries sharing a TTL and their index updates in one transaction"""
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for category, cache_key, value in entries:
+                    pipe.set(cache_key, self.redis.serialize(value), ex=ttl)
+                    index = self._make_key(self._index_key(entity_type, category))
+                    self._queue_index(pipe, index, (cache_key,), ttl)
+                pipe.sadd(self._make_key(_ENTITY_TYPES_KEY), entity_type)
+                await pipe.execute()
+            return True
+        except (TypeError, ValueError, RedisError) as e:
+            logger.error(f"Error caching {entity_type} entries: {e}")
+            return False
+    
+    async def _warm_tracked(
+        self,
+        entity_type: str,
+        category: str,
+        entries: Dict[str, Any],
+        ttl: int
+    ) -> int:
+        """Cache many JSON values of one kind by prefixed key with pipelined SETs, returning count written"""
+        if not entries:
+            return 0
+        
+        index = self._make_key(self._index_key(entity_type, category))
+        items = list(entries.items())
+        try:
+            async with self.redis.pipeline() as pipe:
+                pipe.sadd(self._make_key(_ENTITY_TYPES_KEY), entity_type)
+                for start in range(0, len(items), _WARM_BATCH_SIZE):
+                    batch = items[start:start + _WARM_BATCH_SIZE]
+                    cache_keys = [key for key, _ in batch]
+                    for cache_key, (_, value) in zip(cache_keys, batch):
+                        pipe.set(cache_key, self.redis.serialize(value), ex=ttl)
+                    self._queue_index(pipe, index, cache_keys, ttl)
+                    # Flush per batch to bound the buffered commands
+                    await pipe.execute()
+            return len(items)
+        except (TypeError, ValueError, RedisError) as e:
+            logger.error(f"Error warming {category} cache for {entity_type}: {e}")
+            return 0
+    
+    async def _clear_indexed(
+        self,
+        entity_types: Iterable[str],
+        categories: Tuple[str, ...]
+    ) -> int:
+        """Delete every entry recorded in the key indexes of entity types and kinds"""
+        indexes = [
+            self._make_key(index)
+            for entity_type in entity_types
+            for index in self._index_keys(entity_type, categories)
+        ]
+        if not indexes:
+            return 0
+        try:
+            return await self._clear_indexes(indexes)
+        except RedisError as e:
+            logger.error(f"Error clearing search cache entries: {e}")
+            return 0
+    
+    # Versioned two-tier caching: local cache first, then Redis
+    async def _get_version(self, entity_type: str, category: str) -> str:
+        """Current version token of entity kind, refreshed from Redis at most once per interval"""
+        now = time.monotonic()
+        if now - self._versions_loaded_at > _VERSIONS_REFRESH:
+            versions = await self.redis.hgetall(self._make_key(_VERSIONS_KEY))
+            # Empty on Redis errors too, so keep the last known tokens rather than resetting them
+            if versions:
+                self._versions = versions
+            self._versions_loaded_at = now
+        return self._versions.get(f"{entity_type}:{category}", "0")
+    
+    async def _get_versioned(self, entity_type: str, category: str, key: str) -> Optional[Any]:
+        """Get value of versioned kind by prefixed key from local cache, falling back to Redis"""
+        version = await self._get_version(entity_type, category)
+        local_key = (key, version)
+        
+        value = self._local.get(local_key)
+        if value is None:
+            value = await self.redis.get_json(f"{key}:v{version}")
+            if value is not None:
+                self._local[local_key] = value
+        return value
+    
+    async def _set_versioned(
+        self,
+        entity_type: str,
+        category: str,
+        key: str,
+        value: Any,
+        ttl: int
+    ) -> bool:
+        """Cache value of versioned kind by prefixed key in Redis and in the local cache"""
+        version = await self._get_version(entity_type, category)
+        stored = await self._set_tracked(entity_type, category, f"{key}:v{version}", value, ttl)
+        if stored:
+            self._local[(key, version)] = value
+        return stored
+    
+    async def _bump_versions(
+        self,
+        entity_types: Iterable[str],
+        categories: Tuple[str, ...]
+    ) -> None:
+        """Replace version tokens so local and Redis entries of the kinds go stale.
+        
+        Tokens are unique timestamps rather than counters so they never repeat,
+        even after the versions hash itself has been wiped.
+        """
+        token = str(time.time_ns())
+        kinds = [(entity_type, category) for entity_type in entity_types for category in categories]
+        if not kinds:
+            return
+        
+        versions = {f"{entity_type}:{category}": token for entity_type, category in kinds}
+        index_keys = [self._make_key(self._index_key(*kind)) for kind in kinds]
+        try:
+            async with self.redis.pipeline() as pipe:
+                pipe.hset(self._make_key(_VERSIONS_KEY), mapping=versions)
+                # Stale entries just age out; drop their index so stats stop counting them
+                pipe.unlink(*index_keys)
+                await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Error bumping search cache versions: {e}")
+            return
+        
+        self._versions.update(versions)
     
     # Search results caching
     async def get_search_results(
@@ -30,9 +288,8 @@ class SearchCacheService(CacheService):
         search_params: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
         """Get search results from cache"""
-        params_hash = self._hash_key(search_params)
-        key = f"{entity_type}:results:{params_hash}"
-        return await self.get(key)
+        key = self._k_results[entity_type] + self._hash_key(search_params)
+        return await self.redis.get_json(key)
     
     async def set_search_results(
         self,
@@ -41,9 +298,8 @@ class SearchCacheService(CacheService):
         results: Dict[str, Any]
     ) -> bool:
         """Cache search results"""
-        params_hash = self._hash_key(search_params)
-        key = f"{entity_type}:results:{params_hash}"
-        return await self.set(key, results, ttl=self.ttl_search)
+        key = self._k_results[entity_type] + self._hash_key(search_params)
+        return await self._set_tracked(entity_type, "results", key, results, self.ttl_search)
     
     # Autocomplete caching
     async def get_autocomplete(
@@ -53,10 +309,8 @@ class SearchCacheService(CacheService):
         limit: int = 10
     ) -> Optional[List[str]]:
         """Get autocomplete suggestions from cache"""
-        query_normalized = query.lower().strip()
-        query_hash = self._hash_key(f"{query_normalized}:{limit}")
-        key = f"{entity_type}:autocomplete:{query_hash}"
-        return await self.get(key)
+        key = self._autocomplete_key(entity_type, query, limit)
+        return await self._get_versioned(entity_type, "autocomplete", key)
     
     async def set_autocomplete(
         self,
@@ -66,10 +320,15 @@ class SearchCacheService(CacheService):
         suggestions: List[str]
     ) -> bool:
         """Cache autocomplete suggestions"""
-        query_normalized = query.lower().strip()
-        query_hash = self._hash_key(f"{query_normalized}:{limit}")
-        key = f"{entity_type}:autocomplete:{query_hash}"
-        return await self.set(key, suggestions, ttl=self.ttl_autocomplete)
+        key = self._autocomplete_key(entity_type, query, limit)
+        return await self._set_versioned(
+            entity_type, "autocomplete", key, suggestions, self.ttl_autocomplete
+        )
+    
+    def _autocomplete_key(self, entity_type: str, query: str, limit: int) -> str:
+        """Build prefixed autocomplete key for normalized query"""
+        query_normalized = _normalize_query(query)
+        return self._k_auto[entity_type] + self._hash_key(f"{query_normalized}:{limit}")
     
     # Search suggestions caching
     async def get_search_suggestions(
@@ -78,10 +337,9 @@ class SearchCacheService(CacheService):
         query: str
     ) -> Optional[List[Dict[str, Any]]]:
         """Get search suggestions from cache"""
-        query_normalized = query.lower().strip()
-        query_hash = self._hash_key(query_normalized)
-        key = f"{entity_type}:suggestions:{query_hash}"
-        return await self.get(key)
+        query_normalized = _normalize_query(query)
+        key = self._k_suggestions[entity_type] + self._hash_key(query_normalized)
+        return await self._get_versioned(entity_type, "suggestions", key)
     
     async def set_search_suggestions(
         self,
@@ -90,30 +348,28 @@ class SearchCacheService(CacheService):
         suggestions: List[Dict[str, Any]]
     ) -> bool:
         """Cache search suggestions"""
-        query_normalized = query.lower().strip()
-        query_hash = self._hash_key(query_normalized)
-        key = f"{entity_type}:suggestions:{query_hash}"
-        return await self.set(key, suggestions, ttl=self.ttl_suggestions)
+        query_normalized = _normalize_query(query)
+        key = self._k_suggestions[entity_type] + self._hash_key(query_normalized)
+        return await self._set_versioned(
+            entity_type, "suggestions", key, suggestions, self.ttl_suggestions
+        )
     
-    # Popular searches caching
+    # Popular searches, counted by track_search_query
     async def get_popular_searches(
         self,
         entity_type: str,
         limit: int = 10
     ) -> Optional[List[Dict[str, Any]]]:
-        """Get popular searches from cache"""
-        key = f"{entity_type}:popular:{limit}"
-        return await self.get(key)
-    
-    async def set_popular_searches(
-        self,
-        entity_type: str,
-        limit: int,
-        searches: List[Dict[str, Any]]
-    ) -> bool:
-        """Cache popular searches"""
-        key = f"{entity_type}:popular:{limit}"
-        return await self.set(key, searches, ttl=self.ttl_suggestions)
+        """Get most searched queries of all time with their counts"""
+        _check_entity_type(entity_type)
+        try:
+            ranked = await self.redis.client.zrevrange(
+                self._make_key(f"{entity_type}:popular"), 0, limit - 1, withscores=True
+            )
+        except RedisError as e:
+            logger.error(f"Error reading popular searches for {entity_type}: {e}")
+            return None
+        return [{"query": query.decode(), "count": int(count)} for query, count in ranked]
     
     # Search filters caching
     async def get_search_filters(
@@ -123,8 +379,8 @@ class SearchCacheService(CacheService):
     ) -> Optional[Dict[str, Any]]:
         """Get available search filters from cache"""
         category_key = str(category_id) if category_id else "all"
-        key = f"{entity_type}:filters:{category_key}"
-        return await self.get(key)
+        key = self._k_filters[entity_type] + category_key
+        return await self._get_versioned(entity_type, "filters", key)
     
     async def set_search_filters(
         self,
@@ -134,8 +390,8 @@ class SearchCacheService(CacheService):
     ) -> bool:
         """Cache search filters"""
         category_key = str(category_id) if category_id else "all"
-        key = f"{entity_type}:filters:{category_key}"
-        return await self.set(key, filters, ttl=self.ttl_filters)
+        key = self._k_filters[entity_type] + category_key
+        return await self._set_versioned(entity_type, "filters", key, filters, self.ttl_filters)
     
     # Search facets caching
     async def get_search_facets(
@@ -144,9 +400,8 @@ class SearchCacheService(CacheService):
         search_params: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
         """Get search facets from cache"""
-        params_hash = self._hash_key(search_params)
-        key = f"{entity_type}:facets:{params_hash}"
-        return await self.get(key)
+        key = self._k_facets[entity_type] + self._hash_key(search_params)
+        return await self.redis.get_json(key)
     
     async def set_search_facets(
         self,
@@ -155,26 +410,70 @@ class SearchCacheService(CacheService):
         facets: Dict[str, Any]
     ) -> bool:
         """Cache search facets"""
+        key = self._k_facets[entity_type] + self._hash_key(search_params)
+        return await self._set_tracked(entity_type, "facets", key, facets, self.ttl_search)
+    
+    # Results and facets for the same query, fetched or stored together
+    async def get_search_bundle(
+        self,
+        entity_type: str,
+        search_params: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Get search results and facets from cache in one round trip"""
+        params_hash = self._hash_key(search_params)
+        results, facets = await self.redis.mget_json(
+            self._k_results[entity_type] + params_hash,
+            self._k_facets[entity_type] + params_hash
+        )
+        return results, facets
+    
+    async def set_search_bundle(
+        self,
+        entity_type: str,
+        search_params: Dict[str, Any],
+        results: Dict[str, Any],
+        facets: Dict[str, Any]
+    ) -> bool:
+        """Cache search results and facets in one transaction"""
         params_hash = self._hash_key(search_params)
-        key = f"{entity_type}:facets:{params_hash}"
-        return await self.set(key, facets, ttl=self.ttl_search)
+        return await self._set_tracked_many(
+            entity_type,
+            (
+                ("results", self._k_results[entity_type] + params_hash, results),
+                ("facets", self._k_facets[entity_type] + params_hash, facets),
+            ),
+            self.ttl_search
+        )
     
     # Search analytics caching
     async def track_search_query(self, entity_type: str, query: str) -> None:
         """Track search query for analytics"""
-        query_normalized = query.lower().strip()
+        _check_entity_type(entity_type)
+        query_normalized = _normalize_query(query)
         if not query_normalized:
             return
         
-        # Increment search count
-        key = f"{entity_type}:analytics:queries"
-        await self.hash_set(key, query_normalized, 
-                           await self.hash_get(key, query_normalized) or 0 + 1)
+        if self._track_query_script is None:
+            self._track_query_script = self.redis.register_script(_TRACK_QUERY_SCRIPT)
         
-        # Add to recent searches
-        recent_key = f"{entity_type}:analytics:recent"
-        await self.list_push(recent_key, query_normalized)
-        await self.list_trim(recent_key, 0, 999)  # Keep last 1000 searches
+        now = time.time()
+        hour_key, hour_expires = self._trending_bucket(entity_type, "hour", now)
+        day_key, day_expires = self._trending_bucket(entity_type, "day", now)
+        indexes = self._index_keys(entity_type, ("analytics", "popular", "trending"))
+        try:
+            await self._track_query_script(
+                keys=[
+                    self._make_key(f"{entity_type}:popular"),
+                    self._make_key(f"{entity_type}:analytics:recent"),
+                    hour_key,
+                    day_key,
+                    *map(self._make_key, indexes),
+                    self._make_key(_ENTITY_TYPES_KEY),
+                ],
+                args=[query_normalized, entity_type, hour_expires, day_expires]
+            )
+        except RedisError as e:
+            logger.error(f"Error tracking search query for {entity_type}: {e}")
     
     async def get_search_analytics(
         self,
@@ -182,6 +481,7 @@ class SearchCacheService(CacheService):
         period: str = "day"
     ) -> Optional[Dict[str, Any]]:
         """Get search analytics from cache"""
+        _check_entity_type(entity_type)
         key = f"{entity_type}:analytics:{period}"
         return await self.get(key)
     
@@ -192,9 +492,10 @@ class SearchCacheService(CacheService):
         analytics: Dict[str, Any]
     ) -> bool:
         """Cache search analytics"""
-        key = f"{entity_type}:analytics:{period}"
+        _check_entity_type(entity_type)
+        key = self._make_key(f"{entity_type}:analytics:{period}")
         ttl = 3600 if period == "hour" else 86400  # 1 hour or 1 day
-        return await self.set(key, analytics, ttl=ttl)
+        return await self._set_tracked(entity_type, "analytics", key, analytics, ttl)
     
     # Search performance caching
     async def get_search_performance(
@@ -203,6 +504,7 @@ class SearchCacheService(CacheService):
         query_hash: str
     ) -> Optional[Dict[str, Any]]:
         """Get search performance metrics from cache"""
+        _check_entity_type(entity_type)
         key = f"{entity_type}:performance:{query_hash}"
         return await self.get(key)
     
@@ -213,82 +515,125 @@ class SearchCacheService(CacheService):
         performance: Dict[str, Any]
     ) -> bool:
         """Cache search performance metrics"""
-        key = f"{entity_type}:performance:{query_hash}"
-        return await self.set(key, performance, ttl=3600)  # 1 hour
+        _check_entity_type(entity_type)
+        key = self._make_key(f"{entity_type}:performance:{query_hash}")
+        return await self._set_tracked(entity_type, "performance", key, performance, 3600)  # 1 hour
     
     # Cache invalidation methods
     async def invalidate_search_results(self, entity_type: str) -> None:
         """Invalidate search results for entity type"""
-        await self.clear_pattern(f"{entity_type}:results:*")
-        await self.clear_pattern(f"{entity_type}:facets:*")
+        _check_entity_type(entity_type)
+        await self._clear_indexed((entity_type,), ("results", "facets"))
         logger.info(f"Invalidated search results cache for {entity_type}")
     
     async def invalidate_autocomplete(self, entity_type: str) -> None:
         """Invalidate autocomplete cache for entity type"""
-        await self.clear_pattern(f"{entity_type}:autocomplete:*")
-        await self.clear_pattern(f"{entity_type}:suggestions:*")
+        _check_entity_type(entity_type)
+        await self._bump_versions((entity_type,), ("autocomplete", "suggestions"))
         logger.info(f"Invalidated autocomplete cache for {entity_type}")
     
     async def invalidate_filters(self, entity_type: str) -> None:
         """Invalidate filters cache for entity type"""
-        await self.clear_pattern(f"{entity_type}:filters:*")
+        _check_entity_type(entity_type)
+        await self._bump_versions((entity_type,), ("filters",))
         logger.info(f"Invalidated filters cache for {entity_type}")
     
     async def invalidate_all(self, entity_type: Optional[str] = None) -> None:
         """Invalidate all search caches"""
         if entity_type:
-            await self.clear_pattern(f"{entity_type}:*")
+            _check_entity_type(entity_type)
+            await self._clear_indexed((entity_type,), _STATS_CATEGORIES)
+            await self._bump_versions((entity_type,), _VERSIONED_CATEGORIES)
             logger.info(f"Invalidated all search cache for {entity_type}")
         else:
-            await self.clear_pattern("*")
+            # Walk the indexes of every entity type seen instead of scanning the whole keyspace
+            entity_types = list(await self.redis.smembers(self._make_key(_ENTITY_TYPES_KEY)))
+            await self._clear_indexed(entity_types, _STATS_CATEGORIES)
+            # History lists are per user and not indexed
+            await self.clear_pattern("history:*")
+            await self._bump_versions(entity_types, _VERSIONED_CATEGORIES)
+            self._local.clear()
             logger.info("Invalidated all search caches")
     
     # Bulk operations
     async def warm_popular_searches(
         self,
         entity_type: str,
-        popular_queries: List[str]
+        popular_queries: List[str],
+        results: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> None:
-        """Warm cache with popular search queries"""
+        """Warm cache with popular search queries.
+        
+        Precomputed results are cached under search params {"query": query};
+        queries without results still have to be executed by the search service.
+        """
+        _check_entity_type(entity_type)
+        results = results or {}
+        entries = {}
         for query in popular_queries:
-            # This would typically execute the search to populate cache
-            logger.info(f"Should warm search cache for {entity_type}: {query}")
+            if query in results:
+                key = self._k_results[entity_type] + self._hash_key({"query": query})
+                entries[key] = results[query]
+            else:
+                logger.info(f"Should warm search cache for {entity_type}: {query}")
+        
+        warmed = await self._warm_tracked(entity_type, "results", entries, self.ttl_search)
+        if warmed:
+            logger.info(f"Warmed {warmed} search results for {entity_type}")
     
     async def warm_autocomplete(
         self,
         entity_type: str,
-        common_prefixes: List[str]
+        common_prefixes: List[str],
+        suggestions: Optional[Dict[str, List[str]]] = None,
+        limit: int = 10
     ) -> None:
-        """Warm autocomplete cache with common prefixes"""
+        """Warm autocomplete cache with common prefixes and their precomputed suggestions"""
+        _check_entity_type(entity_type)
+        suggestions = suggestions or {}
+        entries = {}
+        version = await self._get_version(entity_type, "autocomplete")
         for prefix in common_prefixes:
-            # This would typically generate autocomplete suggestions
-            logger.info(f"Should warm autocomplete cache for {entity_type}: {prefix}")
+            if prefix in suggestions:
+                key = self._autocomplete_key(entity_type, prefix, limit)
+                entries[f"{key}:v{version}"] = suggestions[prefix]
+            else:
+                logger.info(f"Should warm autocomplete cache for {entity_type}: {prefix}")
+        
+        warmed = await self._warm_tracked(
+            entity_type, "autocomplete", entries, self.ttl_autocomplete
+        )
+        if warmed:
+            logger.info(f"Warmed {warmed} autocomplete entries for {entity_type}")
     
     # Statistics and monitoring
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics for search"""
-        all_keys = await self.keys("*")
+        try:
+            entity_types = sorted(await self.redis.smembers(self._make_key(_ENTITY_TYPES_KEY)))
+            counts = await self._count_indexes([
+                self._make_key(index)
+                for entity_type in entity_types
+                for index in self._index_keys(entity_type, _STATS_CATEGORIES)
+            ])
+        except RedisError as e:
+            logger.error(f"Error reading search cache stats: {e}")
+            return {}
         
-        stats = {
-            "total_keys": len(all_keys),
-            "results": len([k for k in all_keys if ":results:" in k]),
-            "autocomplete": len([k for k in all_keys if ":autocomplete:" in k]),
-            "suggestions": len([k for k in all_keys if ":suggestions:" in k]),
-            "filters": len([k for k in all_keys if ":filters:" in k]),
-            "facets": len([k for k in all_keys if ":facets:" in k]),
-            "analytics": len([k for k in all_keys if ":analytics:" in k]),
-            "performance": len([k for k in all_keys if ":performance:" in k]),
-            "popular": len([k for k in all_keys if ":popular:" in k]),
-        }
+        per_category = dict.fromkeys(_STATS_CATEGORIES, 0)
+        active_types = []
+        width = len(_STATS_CATEGORIES)
         
-        # Get entity type breakdown
-        entity_types = set()
-        for key in all_keys:
-            if ":" in key:
-                entity_type = key.split(":")[0]
-                entity_types.add(entity_type)
+        for position, entity_type in enumerate(entity_types):
+            entity_counts = counts[position * width:(position + 1) * width]
+            if any(entity_counts):
+                active_types.append(entity_type)
+            for category, count in zip(_STATS_CATEGORIES, entity_counts):
+                per_category[category] += count
         
-        stats["entity_types"] = list(entity_types)
+        stats: Dict[str, Any] = {"total_keys": sum(per_category.values())}
+        stats.update(per_category)
+        stats["entity_types"] = active_types
         
         return stats
     
@@ -313,14 +658,32 @@ class SearchCacheService(CacheService):
         history_item = {
             "query": query,
             "entity_type": entity_type,
-            "timestamp": "now",  # Would use actual timestamp
+            "timestamp": int(time.time()),
             "results_count": results_count
         }
         
-        key = f"history:{user_id or 'anonymous'}"
-        await self.list_push(key, str(history_item))
-        await self.list_trim(key, 0, 99)  # Keep last 100 searches
-        return True
+        key = self._make_key(f"history:{user_id or 'anonymous'}")
+        try:
+            async with self.redis.pipeline() as pipe:
+                pipe.lpush(key, self.redis.serialize(history_item))
+                pipe.ltrim(key, 0, 99)  # Keep last 100 searches
+                await pipe.execute()
+            return True
+        except (TypeError, ValueError, RedisError) as e:
+            logger.error(f"Error adding search to history: {e}")
+            return False
+    
+    def _trending_bucket(
+        self,
+        entity_type: str,
+        period: str,
+        now: float,
+        offset: int = 0
+    ) -> Tuple[str, int]:
+        """Prefixed key of trending bucket containing now (offset buckets later) and its expiry"""
+        length = _TRENDING_PERIODS[period]
+        bucket = int(now // length) + offset
+        return self._make_key(f"{entity_type}:trending:{period}:{bucket}"), (bucket + 2) * length
     
     async def get_trending_searches(
         self,
@@ -328,18 +691,23 @@ class SearchCacheService(CacheService):
         period: str = "day",
         limit: int = 10
     ) -> Optional[List[Dict[str, Any]]]:
-        """Get trending searches from cache"""
-        key = f"{entity_type}:trending:{period}:{limit}"
-        return await self.get(key)
-    
-    async def set_trending_searches(
-        self,
-        entity_type: str,
-        period: str,
-        limit: int,
-        trending: List[Dict[str, Any]]
-    ) -> bool:
-        """Cache trending searches"""
-        key = f"{entity_type}:trending:{period}:{limit}"
-        ttl = 3600 if period == "hour" else 86400  # 1 hour or 1 day
-        return await self.set(key, trending, ttl=ttl)
\ No newline at end of file
+        """Get queries trending over period, blending in the previous period as it decays"""
+        _check_entity_type(entity_type)
+        if period not in _TRENDING_PERIODS:
+            raise ValueError(f"Unknown trending period: {period!r}")
+        
+        now = time.time()
+        current, _ = self._trending_bucket(entity_type, period, now)
+        previous, _ = self._trending_bucket(entity_type, period, now, offset=-1)
+        elapsed = (now % _TRENDING_PERIODS[period]) / _TRENDING_PERIODS[period]
+        try:
+            # ZUNION sorts ascending by blended score
+            blended = await self.redis.client.zunion(
+                {current: 1.0, previous: 1.0 - elapsed}, withscores=True
+            )
+        except RedisError as e:
+            logger.error(f"Error reading trending searches for {entity_type}: {e}")
+            return None
+        
+        top = blended[:-limit - 1:-1] if limit > 0 else []
+        return [{"query": query.decode(), "score": score} for query, score in top]
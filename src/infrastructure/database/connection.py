@@ -1,7 +1,6 @@
 """
 Database connection and session management
 """
-from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import (
@@ -10,11 +9,20 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncEngine
 )
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from ..config.settings import settings
 
 
+# asyncpg connection options: keep prepared statements cached per connection
+# and skip JIT compilation, which only slows down short OLTP queries
+_CONNECT_ARGS = {
+    "statement_cache_size": 1024,
+    "prepared_statement_cache_size": 512,
+    "server_settings": {"jit": "off"},
+}
+
+
 class DatabaseManager:
     """Database connection manager"""
     
@@ -27,9 +35,15 @@ class DatabaseManager:
         self._engine = create_async_engine(
             settings.database_url,
             echo=settings.debug,
-            poolclass=NullPool if settings.debug else None,
-            pool_pre_ping=True,
-            pool_recycle=3600,  # 1 hour
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_use_lifo=True,  # reuse the warmest idle connection first
+            pool_pre_ping=settings.db_pool_pre_ping,
+            pool_recycle=settings.db_pool_recycle,
+            connect_args=_CONNECT_ARGS,
+            insertmanyvalues_page_size=1000,  # rows per multi-row INSERT
         )
         
         self._session_factory = async_sessionmaker(
@@ -58,19 +72,6 @@ class DatabaseManager:
         if not self._session_factory:
             raise RuntimeError("Database not initialized. Call initialize() first.")
         return self._session_factory
-    
-    @asynccontextmanager
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
-        """Get database session context manager"""
-        async with self.session_factory() as session:
-            try:
-                yield session
-                await session.commit()
-            except Exception:
-                await session.rollback()
-                raise
-            finally:
-                await session.close()
 
 
 # Global database manager instance
@@ -78,9 +79,19 @@ db_manager = DatabaseManager()
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency for getting database session"""
-    async with db_manager.get_session() as session:
-        yield session
+    """Dependency for getting database session, committed on success and rolled back on error"""
+    async with db_manager.session_factory() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+def get_db_engine() -> AsyncEngine:
+    """Dependency for getting database engine, for work outside the request session"""
+    return db_manager.engine
 
 
 async def init_database() -> None:
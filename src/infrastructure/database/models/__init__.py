@@ -2,11 +2,40 @@
 Database models package
 """
 
-from .user_model import UserModel, user_roles
+from .base import Base, BaseModel
+from .associations import role_permissions, user_roles
+from .user_model import UserModel
+from .permission_model import PermissionModel
 from .role_model import RoleModel
+from .catalog_model import (
+    PRICE_SCALE,
+    SEARCH_CONFIG,
+    AttributeModel,
+    CategoryAttributeModel,
+    CategoryModel,
+    ProductAttributeModel,
+    ProductImageModel,
+    ProductModel,
+    price_from_minor_units,
+    price_to_minor_units,
+)
 
 __all__ = [
+    "Base",
+    "BaseModel",
     "UserModel",
     "RoleModel", 
-    "user_roles"
-]
\ No newline at end of file
+    "PermissionModel",
+    "user_roles",
+    "role_permissions",
+    "CategoryModel",
+    "AttributeModel",
+    "CategoryAttributeModel",
+    "ProductModel",
+    "ProductImageModel",
+    "ProductAttributeModel",
+    "PRICE_SCALE",
+    "SEARCH_CONFIG",
+    "price_to_minor_units",
+    "price_from_minor_units",
+]
@@ -0,0 +1,29 @@
+"""
+Association tables for many-to-many relationships
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, SmallInteger, Table
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+# Association table for user-role many-to-many relationship
+user_roles = Table(
+    'user_roles',
+    Base.metadata,
+    Column('user_id', UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+    Column('role_id', UUID(as_uuid=True), ForeignKey('roles.id', ondelete='CASCADE'), primary_key=True),
+    Column('assigned_at', DateTime(timezone=True), server_default=func.now()),
+    Column('assigned_by', UUID(as_uuid=True), ForeignKey('users.id'), nullable=True)
+)
+
+
+# Association table for role-permission many-to-many relationship
+role_permissions = Table(
+    'role_permissions',
+    Base.metadata,
+    Column('role_id', UUID(as_uuid=True), ForeignKey('roles.id', ondelete='CASCADE'), primary_key=True),
+    Column('permission_id', SmallInteger, ForeignKey('permissions.id', ondelete='CASCADE'), primary_key=True)
+)
@@ -3,14 +3,18 @@ Base model for SQLAlchemy models
 """
 
 from datetime import datetime
-from uuid import UUID, uuid4
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence
+from uuid import UUID
 
-from sqlalchemy import Column, DateTime
-from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy import Column, DateTime, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID, insert as pg_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
+from ....domain.value_objects.common import uuid7
+
 Base = declarative_base()
 
 
@@ -29,12 +33,74 @@ class TimestampMixin:
     )
 
 
-class BaseModel(Base, TimestampMixin):
+class BulkInsertMixin:
+    """Mixin adding batched multi-row inserts and upserts"""
+    
+    if TYPE_CHECKING:
+        # Primary key of the mapped class; not declared here so it is not mapped twice
+        id: Mapped[Any]
+    
+    @classmethod
+    async def bulk_create(
+        cls,
+        session: AsyncSession,
+        rows: Sequence[Dict[str, Any]],
+        page_size: int = 1000
+    ) -> List[UUID]:
+        """Insert rows given as column mappings, page_size rows per INSERT statement.
+        
+        Column defaults are applied as usual; returns the new ids in row order.
+        """
+        if not rows:
+            return []
+        result = await session.execute(
+            insert(cls).returning(cls.id, sort_by_parameter_order=True),
+            list(rows),
+            execution_options={"insertmanyvalues_page_size": page_size}
+        )
+        return list(result.scalars())
+    
+    @classmethod
+    async def bulk_upsert(
+        cls,
+        session: AsyncSession,
+        rows: Sequence[Dict[str, Any]],
+        conflict_cols: Sequence[str],
+        update_cols: Sequence[str] = (),
+        page_size: int = 1000
+    ) -> None:
+        """Insert rows, updating update_cols of rows that conflict on conflict_cols.
+        
+        Uses INSERT ... ON CONFLICT, page_size rows per statement; with no
+        update_cols conflicting rows are left unchanged.
+        """
+        if not rows:
+            return
+        stmt = pg_insert(cls)
+        if update_cols:
+            set_: Dict[str, Any] = {col: stmt.excluded[col] for col in update_cols}
+            if issubclass(cls, TimestampMixin):
+                # ON CONFLICT DO UPDATE skips the ORM onupdate hook
+                set_.setdefault("updated_at", func.now())
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(conflict_cols),
+                set_=set_
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_cols))
+        await session.execute(
+            stmt,
+            list(rows),
+            execution_options={"insertmanyvalues_page_size": page_size}
+        )
+
+
+class BaseModel(Base, TimestampMixin, BulkInsertMixin):
     """Base model with ID and timestamps"""
     __abstract__ = True
     
     id: Mapped[UUID] = mapped_column(
         PostgresUUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid4
+        default=uuid7
     )
\ No newline at end of file
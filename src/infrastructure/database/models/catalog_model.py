@@ -1,61 +1,87 @@
 """
 SQLAlchemy database models for Product Catalog Service
 """
-from datetime import datetime
-from decimal import Decimal
-from typing import List, Optional
-from uuid import UUID, uuid4
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, List, Optional
+from uuid import UUID
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, ForeignKey, Integer, 
-    Numeric, String, Text, Enum as SQLEnum, Index
+    BigInteger, Boolean, Column, ColumnElement, Computed, ForeignKey, Integer, 
+    Numeric, String, Text, Index, cast, text
 )
-from sqlalchemy.dialects.postgresql import UUID as PostgresUUID, ARRAY
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID as PostgresUUID
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from sqlalchemy.sql import func
 
-from ...domain.value_objects.product import ProductStatus
-from ...domain.value_objects.attribute import AttributeType
+from ....domain.value_objects.common import uuid7
+from ....domain.value_objects.product import ProductStatus
+from ....domain.value_objects.attribute import AttributeType
+from .base import Base, BulkInsertMixin, TimestampMixin
+from .types import Ltree, SmallIntEnum
 
-Base = declarative_base()
+# Prices are stored as integer minor units (cents)
+PRICE_SCALE = 100
 
 
-class TimestampMixin:
-    """Mixin for created_at and updated_at timestamps"""
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), 
-        server_default=func.now(),
-        nullable=False
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), 
-        server_default=func.now(),
-        onupdate=func.now(),
-        nullable=False
-    )
+def price_to_minor_units(amount: Any) -> int:
+    """Convert a price in currency units to integer minor units"""
+    return int((Decimal(str(amount)) * PRICE_SCALE).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def price_from_minor_units(value: Any) -> Decimal:
+    """Convert integer minor units back to a price in currency units"""
+    return Decimal(value) / PRICE_SCALE
+
 
+# Text search configuration of the search_vector columns and of queries against them
+SEARCH_CONFIG = "english"
 
-class CategoryModel(Base, TimestampMixin):
+# Stored SMALLINT codes for enum columns; append new members, never renumber
+PRODUCT_STATUS_CODES = {
+    ProductStatus.DRAFT: 0,
+    ProductStatus.ACTIVE: 1,
+    ProductStatus.INACTIVE: 2,
+    ProductStatus.ARCHIVED: 3,
+}
+ATTRIBUTE_TYPE_CODES = {
+    AttributeType.STRING: 0,
+    AttributeType.NUMBER: 1,
+    AttributeType.BOOLEAN: 2,
+    AttributeType.LIST: 3,
+    AttributeType.DATE: 4,
+}
+
+
+class CategoryModel(Base, TimestampMixin, BulkInsertMixin):
     """Category database model with hierarchical structure using LTREE"""
     __tablename__ = "categories"
 
     id: Mapped[UUID] = mapped_column(
         PostgresUUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid4
+        default=uuid7
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     slug: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
     description: Mapped[Optional[str]] = mapped_column(Text)
     
     # Hierarchical path (e.g., "electronics.phones.smartphones")
-    path: Mapped[str] = mapped_column(String(500), nullable=False)
+    path: Mapped[str] = mapped_column(Ltree, nullable=False)
     
-    # SEO fields
+    # SEO fields; long text is deferred until a detail view asks for the "seo" group
     meta_title: Mapped[Optional[str]] = mapped_column(String(255))
-    meta_description: Mapped[Optional[str]] = mapped_column(Text)
-    meta_keywords: Mapped[Optional[str]] = mapped_column(Text)
+    meta_description: Mapped[Optional[str]] = mapped_column(Text, deferred=True, deferred_group="seo")
+    meta_keywords: Mapped[Optional[str]] = mapped_column(Text, deferred=True, deferred_group="seo")
+    
+    # Full-text search document, maintained by the database and never loaded
+    search_vector: Mapped[Any] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"to_tsvector('{SEARCH_CONFIG}', coalesce(name, '') || ' ' || coalesce(description, ''))",
+            persisted=True
+        ),
+        deferred=True
+    )
     
     # Status
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
@@ -67,34 +93,39 @@ class CategoryModel(Base, TimestampMixin):
     products: Mapped[List["ProductModel"]] = relationship(
         "ProductModel", 
         back_populates="category",
-        cascade="all, delete-orphan"
+        cascade="save-update, merge",
+        # products.category_id is ON DELETE RESTRICT; leave enforcement to the database
+        passive_deletes="all"
     )
     
     category_attributes: Mapped[List["CategoryAttributeModel"]] = relationship(
         "CategoryAttributeModel",
         back_populates="category",
-        cascade="all, delete-orphan"
+        cascade="save-update, merge",
+        passive_deletes="all"  # rows go with ON DELETE CASCADE
     )
 
     # Indexes
     __table_args__ = (
-        Index('ix_categories_path', 'path'),
+        Index('ix_categories_path_gist', 'path', postgresql_using='gist'),
         Index('ix_categories_slug', 'slug'),
-        Index('ix_categories_active', 'is_active'),
+        Index('ix_categories_search', 'search_vector', postgresql_using='gin'),
+        # Partial: queries only ever look for active rows
+        Index('ix_categories_active', 'is_active', postgresql_where=text('is_active')),
     )
 
     def __repr__(self) -> str:
         return f"<CategoryModel(id={self.id}, name='{self.name}', path='{self.path}')>"
 
 
-class AttributeModel(Base, TimestampMixin):
+class AttributeModel(Base, TimestampMixin, BulkInsertMixin):
     """Attribute definition model"""
     __tablename__ = "attributes"
 
     id: Mapped[UUID] = mapped_column(
         PostgresUUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid4
+        default=uuid7
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     slug: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
@@ -102,7 +133,7 @@ class AttributeModel(Base, TimestampMixin):
     
     # Attribute type
     type: Mapped[AttributeType] = mapped_column(
-        SQLEnum(AttributeType), 
+        SmallIntEnum(AttributeType, ATTRIBUTE_TYPE_CODES), 
         nullable=False
     )
     
@@ -127,20 +158,22 @@ class AttributeModel(Base, TimestampMixin):
     category_attributes: Mapped[List["CategoryAttributeModel"]] = relationship(
         "CategoryAttributeModel",
         back_populates="attribute",
-        cascade="all, delete-orphan"
+        cascade="save-update, merge",
+        passive_deletes="all"  # rows go with ON DELETE CASCADE
     )
     
     product_attributes: Mapped[List["ProductAttributeModel"]] = relationship(
         "ProductAttributeModel",
         back_populates="attribute",
-        cascade="all, delete-orphan"
+        cascade="save-update, merge",
+        passive_deletes="all"  # rows go with ON DELETE CASCADE
     )
 
     # Indexes
     __table_args__ = (
         Index('ix_attributes_slug', 'slug'),
         Index('ix_attributes_type', 'type'),
-        Index('ix_attributes_active', 'is_active'),
+        Index('ix_attributes_active', 'is_active', postgresql_where=text('is_active')),
     )
 
     def __repr__(self) -> str:
@@ -154,7 +187,7 @@ class CategoryAttributeModel(Base, TimestampMixin):
     id: Mapped[UUID] = mapped_column(
         PostgresUUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid4
+        default=uuid7
     )
     
     category_id: Mapped[UUID] = mapped_column(
@@ -199,37 +232,41 @@ class CategoryAttributeModel(Base, TimestampMixin):
         return f"<CategoryAttributeModel(category_id={self.category_id}, attribute_id={self.attribute_id})>"
 
 
-class ProductModel(Base, TimestampMixin):
+class ProductModel(Base, TimestampMixin, BulkInsertMixin):
     """Product database model"""
     __tablename__ = "products"
 
     id: Mapped[UUID] = mapped_column(
         PostgresUUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid4
+        default=uuid7
     )
     
     # Basic product info
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     slug: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
     description: Mapped[Optional[str]] = mapped_column(Text)
-    short_description: Mapped[Optional[str]] = mapped_column(Text)
+    short_description: Mapped[Optional[str]] = mapped_column(Text, deferred=True, deferred_group="seo")
     
     # SKU
     sku: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
     
-    # Pricing
-    price: Mapped[Decimal] = mapped_column(
-        Numeric(precision=10, scale=2), 
-        nullable=False
-    )
-    compare_price: Mapped[Optional[Decimal]] = mapped_column(
-        Numeric(precision=10, scale=2)
-    )
-    cost_price: Mapped[Optional[Decimal]] = mapped_column(
-        Numeric(precision=10, scale=2)
+    # Full-text search document, maintained by the database and never loaded
+    search_vector: Mapped[Any] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"to_tsvector('{SEARCH_CONFIG}', coalesce(name, '') || ' ' || coalesce(description, '')"
+            " || ' ' || coalesce(short_description, '') || ' ' || coalesce(sku, ''))",
+            persisted=True
+        ),
+        deferred=True
     )
     
+    # Pricing, in minor units (see PRICE_SCALE)
+    price: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    compare_price: Mapped[Optional[int]] = mapped_column(BigInteger)
+    cost_price: Mapped[Optional[int]] = mapped_column(BigInteger)
+    
     # Inventory
     track_inventory: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     inventory_quantity: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -241,17 +278,14 @@ class ProductModel(Base, TimestampMixin):
     width: Mapped[Optional[Decimal]] = mapped_column(Numeric(precision=8, scale=3))
     height: Mapped[Optional[Decimal]] = mapped_column(Numeric(precision=8, scale=3))
     
-    # Images (array of URLs)
-    images: Mapped[Optional[List[str]]] = mapped_column(ARRAY(String))
-    
-    # SEO fields
+    # SEO fields; long text is deferred until a detail view asks for the "seo" group
     meta_title: Mapped[Optional[str]] = mapped_column(String(255))
-    meta_description: Mapped[Optional[str]] = mapped_column(Text)
-    meta_keywords: Mapped[Optional[str]] = mapped_column(Text)
+    meta_description: Mapped[Optional[str]] = mapped_column(Text, deferred=True, deferred_group="seo")
+    meta_keywords: Mapped[Optional[str]] = mapped_column(Text, deferred=True, deferred_group="seo")
     
     # Status and visibility
     status: Mapped[ProductStatus] = mapped_column(
-        SQLEnum(ProductStatus), 
+        SmallIntEnum(ProductStatus, PRODUCT_STATUS_CODES), 
         default=ProductStatus.DRAFT,
         nullable=False
     )
@@ -276,24 +310,94 @@ class ProductModel(Base, TimestampMixin):
     product_attributes: Mapped[List["ProductAttributeModel"]] = relationship(
         "ProductAttributeModel",
         back_populates="product",
-        cascade="all, delete-orphan"
+        cascade="save-update, merge",
+        passive_deletes="all"  # rows go with ON DELETE CASCADE
+    )
+    
+    # Images live in their own table; loaded only where a query asks for them
+    images: Mapped[List["ProductImageModel"]] = relationship(
+        "ProductImageModel",
+        back_populates="product",
+        order_by="ProductImageModel.sort_order",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql"
     )
 
     # Indexes
     __table_args__ = (
         Index('ix_products_slug', 'slug'),
         Index('ix_products_sku', 'sku'),
-        Index('ix_products_category', 'category_id'),
-        Index('ix_products_status', 'status'),
+        Index('ix_products_search', 'search_vector', postgresql_using='gin'),
+        # Trigram index for partial SKU matches, which word search does not cover
+        Index(
+            'ix_products_sku_trgm', 'sku',
+            postgresql_using='gin',
+            postgresql_ops={'sku': 'gin_trgm_ops'}
+        ),
+        # Category and status listings in (sort_order, id) keyset order
+        Index('ix_products_category_order', 'category_id', 'sort_order', 'id'),
+        Index('ix_products_status_order', 'status', 'sort_order', 'id'),
+        # Active products in category listing order
+        Index(
+            'ix_products_status_active', 'category_id', 'sort_order',
+            postgresql_where=text(f"status = {PRODUCT_STATUS_CODES[ProductStatus.ACTIVE]}")
+        ),
         Index('ix_products_featured', 'is_featured'),
         Index('ix_products_price', 'price'),
         Index('ix_products_name_search', 'name'),
     )
 
+    @hybrid_property
+    def price_decimal(self) -> Decimal:
+        """Price in currency units, for display"""
+        return price_from_minor_units(self.price)
+
+    @price_decimal.inplace.expression
+    @classmethod
+    def _price_decimal_expression(cls) -> ColumnElement[Decimal]:
+        return cast(cls.price, Numeric(precision=12, scale=2)) / PRICE_SCALE
+
     def __repr__(self) -> str:
         return f"<ProductModel(id={self.id}, name='{self.name}', sku='{self.sku}')>"
 
 
+class ProductImageModel(Base):
+    """Product image URL with its position in the gallery"""
+    __tablename__ = "product_images"
+
+    id: Mapped[UUID] = mapped_column(
+        PostgresUUID(as_uuid=True), 
+        primary_key=True, 
+        default=uuid7
+    )
+    
+    product_id: Mapped[UUID] = mapped_column(
+        PostgresUUID(as_uuid=True),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    
+    url: Mapped[str] = mapped_column(String(2048), nullable=False)
+    
+    # Position within the product gallery
+    sort_order: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    
+    # Relationships
+    product: Mapped["ProductModel"] = relationship(
+        "ProductModel", 
+        back_populates="images"
+    )
+
+    # Indexes
+    __table_args__ = (
+        Index('ix_product_images_product', 'product_id', 'sort_order'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ProductImageModel(product_id={self.product_id}, sort_order={self.sort_order})>"
+
+
 class ProductAttributeModel(Base, TimestampMixin):
     """Product attribute values"""
     __tablename__ = "product_attributes"
@@ -301,7 +405,7 @@ class ProductAttributeModel(Base, TimestampMixin):
     id: Mapped[UUID] = mapped_column(
         PostgresUUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid4
+        default=uuid7
     )
     
     product_id: Mapped[UUID] = mapped_column(
@@ -316,8 +420,8 @@ class ProductAttributeModel(Base, TimestampMixin):
         nullable=False
     )
     
-    # Attribute value (stored as text, parsed based on attribute type)
-    value: Mapped[str] = mapped_column(Text, nullable=False)
+    # Attribute value as typed JSON: string, number, boolean or list
+    value: Mapped[Any] = mapped_column(JSONB, nullable=False)
     
     # Relationships
     product: Mapped["ProductModel"] = relationship(
@@ -335,8 +439,31 @@ class ProductAttributeModel(Base, TimestampMixin):
         Index('ix_product_attributes_product', 'product_id'),
         Index('ix_product_attributes_attribute', 'attribute_id'),
         Index('ix_product_attributes_unique', 'product_id', 'attribute_id', unique=True),
-        Index('ix_product_attributes_value', 'value'),
+        # Containment filters (value @> ...) for facet lookups
+        Index(
+            'ix_product_attributes_value_gin', 'value',
+            postgresql_using='gin',
+            postgresql_ops={'value': 'jsonb_path_ops'}
+        ),
+        # Range filters on numeric attribute values
+        Index(
+            'ix_product_attributes_value_number', 'attribute_id', text("((value #>> '{}')::numeric)"),
+            postgresql_where=text("jsonb_typeof(value) = 'number'")
+        ),
     )
 
+    @hybrid_property
+    def number_value(self) -> Optional[Decimal]:
+        """Numeric value, or None for non-numeric attributes"""
+        if isinstance(self.value, (int, float)) and not isinstance(self.value, bool):
+            return Decimal(str(self.value))
+        return None
+
+    @number_value.inplace.expression
+    @classmethod
+    def _number_value_expression(cls) -> ColumnElement[Decimal]:
+        # Matches the ix_product_attributes_value_number expression
+        return cast(cls.value.op("#>>")(text("'{}'")), Numeric)
+
     def __repr__(self) -> str:
         return f"<ProductAttributeModel(product_id={self.product_id}, attribute_id={self.attribute_id}, value='{self.value}')>"
\ No newline at end of file
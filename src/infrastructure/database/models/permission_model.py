@@ -0,0 +1,33 @@
+"""
+Permission SQLAlchemy model
+"""
+
+from typing import Dict
+
+from sqlalchemy import Column, SmallInteger, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+# Permission name -> id for permissions seen in role masks; ids double as bit positions
+PERMISSION_IDS: Dict[str, int] = {}
+
+
+class PermissionModel(Base):
+    """Permission SQLAlchemy model"""
+    
+    __tablename__ = "permissions"
+    
+    # Small integer ids so each permission maps to one bit of a role mask
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, autoincrement=True)
+    name = Column(String(100), unique=True, nullable=False)
+    description = Column(Text, nullable=True)
+    
+    def __repr__(self) -> str:
+        return f"<PermissionModel(id={self.id}, name={self.name})>"
+    
+    @property
+    def bit(self) -> int:
+        """Bit for this permission in a role permission mask"""
+        return 1 << int(self.id)
@@ -2,14 +2,14 @@
 Role SQLAlchemy model
 """
 
-from typing import List
+from typing import Any, Dict, List
 
-from sqlalchemy import Boolean, Column, String, Text, Table, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Boolean, Column, String, Text, event
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
-from .user_model import user_roles
+from .associations import role_permissions, user_roles
+from .permission_model import PERMISSION_IDS
 
 
 class RoleModel(BaseModel):
@@ -21,9 +21,6 @@ class RoleModel(BaseModel):
     name = Column(String(50), unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
     
-    # Permissions stored as array of strings
-    permissions = Column(ARRAY(String), default=[], nullable=False)
-    
     # Status flags
     is_active = Column(Boolean, default=True, nullable=False)
     is_system = Column(Boolean, default=False, nullable=False)
@@ -32,32 +29,59 @@ class RoleModel(BaseModel):
     users = relationship(
         "UserModel",
         secondary=user_roles,
+        primaryjoin="RoleModel.id == user_roles.c.role_id",
+        secondaryjoin="UserModel.id == user_roles.c.user_id",
         back_populates="roles",
-        lazy="selectin"
+        # Loaded only where a query asks for it; implicit loads fail loudly
+        lazy="raise_on_sql",
+        passive_deletes=True
+    )
+    
+    # Granted permissions; loaded with the role since every check needs them
+    permissions = relationship(
+        "PermissionModel",
+        secondary=role_permissions,
+        lazy="selectin",
+        passive_deletes=True
     )
     
     def __repr__(self) -> str:
         return f"<RoleModel(id={self.id}, name={self.name})>"
     
+    @property
+    def permission_mask(self) -> int:
+        """Granted permissions as a bitmask, built on first use and reset when permissions change or are reloaded"""
+        mask = self.__dict__.get("_permission_mask")
+        if mask is None:
+            mask = 0
+            for permission in self.permissions:
+                mask |= permission.bit
+                PERMISSION_IDS[permission.name] = permission.id
+            self.__dict__["_permission_mask"] = mask
+        return mask
+    
     def has_permission(self, permission: str) -> bool:
         """Check if role has specific permission"""
+        # Answers are memoized per requested string, so repeated checks are one dict lookup
+        checks: Dict[str, bool] = self.__dict__.setdefault("_permission_checks", {})
+        granted = checks.get(permission)
+        if granted is None:
+            granted = checks[permission] = self._resolve_permission(permission)
+        return granted
+    
+    def _resolve_permission(self, permission: str) -> bool:
+        """Match permission against granted permissions and wildcards"""
         permission = permission.strip().lower()
+        # Building the mask registers the ids of every granted permission
+        mask = self.permission_mask
         
-        # Check for wildcard permission
-        if "*" in self.permissions:
-            return True
-        
-        # Check for exact permission
-        if permission in self.permissions:
-            return True
-        
-        # Check for resource-level wildcard (e.g., "users.*")
-        resource = permission.split('.')[0]
-        resource_wildcard = f"{resource}.*"
-        if resource_wildcard in self.permissions:
-            return True
-        
-        return False
+        # Wildcard, exact permission, or resource-level wildcard (e.g., "users.*")
+        wanted = 0
+        for name in ("*", permission, permission.partition(".")[0] + ".*"):
+            permission_id = PERMISSION_IDS.get(name)
+            if permission_id is not None:
+                wanted |= 1 << permission_id
+        return bool(mask & wanted)
     
     def has_any_permission(self, permissions: List[str]) -> bool:
         """Check if role has any of the specified permissions"""
@@ -73,4 +97,17 @@ class RoleModel(BaseModel):
     
     def is_manager_role(self) -> bool:
         """Check if this is a manager role"""
-        return self.name in ["SUPER_ADMIN", "ADMIN", "MANAGER"]
\ No newline at end of file
+        return self.name in ["SUPER_ADMIN", "ADMIN", "MANAGER"]
+
+
+def _reset_permission_mask(target: RoleModel, *args: Any) -> None:
+    """Drop cached permission mask and answers so they are rebuilt from current permissions"""
+    target.__dict__.pop("_permission_mask", None)
+    target.__dict__.pop("_permission_checks", None)
+
+
+event.listen(RoleModel.permissions, "append", _reset_permission_mask)
+event.listen(RoleModel.permissions, "remove", _reset_permission_mask)
+event.listen(RoleModel.permissions, "set", _reset_permission_mask)
+event.listen(RoleModel, "expire", _reset_permission_mask)
+event.listen(RoleModel, "refresh", _reset_permission_mask)
@@ -0,0 +1,62 @@
+"""
+Custom column types for PostgreSQL extensions
+"""
+
+from enum import Enum
+from typing import Any, Callable, Dict, Mapping, Optional, Type
+
+from sqlalchemy import ColumnElement
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import SmallInteger, TypeDecorator, UserDefinedType
+
+
+class Ltree(UserDefinedType):
+    """PostgreSQL ltree label path (requires the ltree extension)"""
+    
+    cache_ok = True
+    
+    class comparator_factory(UserDefinedType.Comparator):
+        """Hierarchy operators, all supported by a GiST index on the column"""
+        
+        def descendant_of(self, other: Any) -> ColumnElement[bool]:
+            """Path is other or below it (<@)"""
+            return self.expr.bool_op("<@")(other)
+        
+        def ancestor_of(self, other: Any) -> ColumnElement[bool]:
+            """Path is other or above it (@>)"""
+            return self.expr.bool_op("@>")(other)
+        
+        def lquery(self, pattern: str) -> ColumnElement[bool]:
+            """Path matches an lquery pattern (~)"""
+            return self.expr.bool_op("~")(pattern)
+    
+    def get_col_spec(self, **kw: Any) -> str:
+        return "LTREE"
+    
+    def bind_processor(self, dialect: Dialect) -> Optional[Callable[[Any], Any]]:
+        def process(value: Any) -> Any:
+            return None if value is None else str(value)
+        return process
+
+
+class SmallIntEnum(TypeDecorator):
+    """Python enum stored as a SMALLINT code; codes must never be reused"""
+    
+    impl = SmallInteger
+    cache_ok = True
+    
+    def __init__(self, enum_class: Type[Enum], codes: Mapping[Any, int]):
+        super().__init__()
+        self.enum_class = enum_class
+        self._codes: Dict[Any, int] = dict(codes)
+        self._members: Dict[int, Any] = {code: member for member, code in self._codes.items()}
+    
+    def process_bind_param(self, value: Any, dialect: Dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return self._codes[self.enum_class(value)]
+    
+    def process_result_value(self, value: Optional[int], dialect: Dialect) -> Any:
+        if value is None:
+            return None
+        return self._members[value]
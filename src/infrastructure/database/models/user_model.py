@@ -3,41 +3,73 @@ User SQLAlchemy model
 """
 
 from datetime import datetime
-from typing import List
+from typing import Any, FrozenSet, Iterable, List, Optional
 from uuid import uuid4
 
-from sqlalchemy import Boolean, Column, DateTime, String, Text, Table, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy import Boolean, Column, Computed, DateTime, String, Text, Index, event
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from .associations import user_roles
 from .base import BaseModel
 
 
-# Association table for user-role many-to-many relationship
-user_roles = Table(
-    'user_roles',
-    BaseModel.metadata,
-    Column('user_id', UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
-    Column('role_id', UUID(as_uuid=True), ForeignKey('roles.id', ondelete='CASCADE'), primary_key=True),
-    Column('assigned_at', DateTime(timezone=True), server_default=func.now()),
-    Column('assigned_by', UUID(as_uuid=True), ForeignKey('users.id'), nullable=True)
-)
-
-
 class UserModel(BaseModel):
     """User SQLAlchemy model"""
     
     __tablename__ = "users"
+    __table_args__ = (
+        # Unique lookup indexes that also cover the columns login and profile
+        # lookups read, so those are answered by index-only scans
+        Index(
+            "ix_users_email_auth",
+            "email",
+            unique=True,
+            postgresql_include=["is_active", "password_hash", "id"],
+        ),
+        Index(
+            "ix_users_username_auth",
+            "username",
+            unique=True,
+            postgresql_include=["is_active", "password_hash", "id"],
+        ),
+        # Role filters become a containment lookup on the denormalized names
+        Index("ix_users_role_names_cache", "role_names_cache", postgresql_using="gin"),
+        # Trigram indexes serving ILIKE '%term%' user search (see migration c6f1a9d3b274)
+        *(
+            Index(
+                f"ix_users_{column}_trgm", column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"}
+            )
+            for column in ("username", "email", "display_name")
+        ),
+    )
+    
+    # Fetch server-generated values (display_name, role_names_cache,
+    # timestamps) via RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
     
-    # Basic user information
-    email = Column(String(255), unique=True, nullable=False, index=True)
-    username = Column(String(100), unique=True, nullable=False, index=True)
+    # Basic user information; uniqueness is enforced by the indexes above
+    email = Column(String(255), nullable=False)
+    username = Column(String(100), nullable=False)
     password_hash = Column(String(255), nullable=False)
     
     # Profile information
     first_name = Column(String(100), nullable=True)
     last_name = Column(String(100), nullable=True)
+    display_name: Mapped[Optional[str]] = mapped_column(
+        String(201),
+        Computed(
+            "COALESCE(NULLIF(trim(COALESCE(first_name, '') || ' ' || COALESCE(last_name, '')), ''), username)",
+            persisted=True
+        )
+    )
+    
+    # Role names kept in sync by triggers on user_roles and roles (see migration 7c1f4b9e2d36)
+    role_names_cache: Mapped[List[str]] = mapped_column(
+        ARRAY(String(50)), server_default="{}", nullable=False
+    )
     
     # Status flags
     is_active = Column(Boolean, default=True, nullable=False)
@@ -50,8 +82,13 @@ class UserModel(BaseModel):
     roles = relationship(
         "RoleModel",
         secondary=user_roles,
+        # user_roles.assigned_by also references users; join on user_id only
+        primaryjoin="UserModel.id == user_roles.c.user_id",
+        secondaryjoin="RoleModel.id == user_roles.c.role_id",
         back_populates="users",
-        lazy="selectin"
+        # Loaded only where a query asks for it; implicit loads fail loudly
+        lazy="raise_on_sql",
+        passive_deletes=True
     )
     
     # Self-referential relationship for assigned_by in user_roles
@@ -69,6 +106,10 @@ class UserModel(BaseModel):
     @property
     def full_name(self) -> str:
         """Get full name"""
+        # Prefer the generated column; it is expired after writes until reloaded
+        display_name: Optional[str] = self.__dict__.get("display_name")
+        if display_name is not None:
+            return display_name
         if self.first_name and self.last_name:
             return f"{self.first_name} {self.last_name}"
         elif self.first_name:
@@ -81,15 +122,28 @@ class UserModel(BaseModel):
     @property
     def role_names(self) -> List[str]:
         """Get list of role names"""
-        return [role.name for role in self.roles]
+        return list(self.role_names_cache or ())
+    
+    @property
+    def role_name_set(self) -> FrozenSet[str]:
+        """Role names as a set, built on first use and reset when roles change or are reloaded"""
+        names = self.__dict__.get("_role_name_set")
+        if names is None:
+            # A loaded roles collection reflects unflushed changes the cache column does not
+            if "roles" in self.__dict__:
+                names = frozenset(role.name for role in self.roles)
+            else:
+                names = frozenset(self.role_names_cache or ())
+            self.__dict__["_role_name_set"] = names
+        return names
     
     def has_role(self, role_name: str) -> bool:
         """Check if user has specific role"""
-        return role_name in self.role_names
+        return role_name in self.role_name_set
     
-    def has_any_role(self, role_names: List[str]) -> bool:
+    def has_any_role(self, role_names: Iterable[str]) -> bool:
         """Check if user has any of the specified roles"""
-        return any(role in self.role_names for role in role_names)
+        return not self.role_name_set.isdisjoint(role_names)
     
     def is_admin(self) -> bool:
         """Check if user has admin privileges"""
@@ -97,4 +151,17 @@ class UserModel(BaseModel):
     
     def is_manager(self) -> bool:
         """Check if user has manager privileges"""
-        return self.has_any_role(["SUPER_ADMIN", "ADMIN", "MANAGER"])
\ No newline at end of file
+        return self.has_any_role(["SUPER_ADMIN", "ADMIN", "MANAGER"])
+
+
+def _reset_role_name_set(target: UserModel, *args: Any) -> None:
+    """Drop cached role name set so it is rebuilt from current roles"""
+    target.__dict__.pop("_role_name_set", None)
+
+
+event.listen(UserModel.roles, "append", _reset_role_name_set)
+event.listen(UserModel.roles, "remove", _reset_role_name_set)
+event.listen(UserModel.roles, "set", _reset_role_name_set)
+event.listen(UserModel.role_names_cache, "set", _reset_role_name_set)
+event.listen(UserModel, "expire", _reset_role_name_set)
+event.listen(UserModel, "refresh", _reset_role_name_set)
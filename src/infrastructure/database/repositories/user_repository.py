@@ -2,14 +2,16 @@
 User repository implementation
 """
 
+import functools
+import inspect
 import logging
-from typing import List, Optional
+import warnings
+from typing import Any, Callable, Concatenate, Coroutine, Dict, List, Optional, ParamSpec, Tuple, TypeVar
 from uuid import UUID
 
-from sqlalchemy import and_, func, or_
+from sqlalchemy import and_, bindparam, delete, exists, func, lambda_stmt, or_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 
 from ....domain.entities.user import User
 from ....domain.repositories.user_repository import UserRepository
@@ -20,6 +22,72 @@ from ..connection import get_db_session
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per batch when streaming unbounded result sets
+_STREAM_BATCH_SIZE = 500
+
+# Hot lookups, built once and served from the compiled statement cache
+_GET_USER_BY_ID = lambda_stmt(
+    lambda: select(UserModel).where(UserModel.id == bindparam("id"))
+)
+_GET_USER_BY_EMAIL = lambda_stmt(
+    lambda: select(UserModel).where(UserModel.email == bindparam("email"))
+)
+_GET_USER_BY_USERNAME = lambda_stmt(
+    lambda: select(UserModel).where(UserModel.username == bindparam("username"))
+)
+_USER_EMAIL_EXISTS = lambda_stmt(
+    lambda: select(exists().where(UserModel.email == bindparam("email")))
+)
+_USER_USERNAME_EXISTS = lambda_stmt(
+    lambda: select(exists().where(UserModel.username == bindparam("username")))
+)
+
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+_RepositoryMethod = Callable[Concatenate[Any, _P], Coroutine[Any, Any, _R]]
+
+
+def _log_errors(
+    action: str,
+    rollback: bool = False
+) -> Callable[[_RepositoryMethod[_P, _R]], _RepositoryMethod[_P, _R]]:
+    """Log repository failures as "Failed to <action>", rolling back writes first.
+    
+    action is a str.format template over the method's arguments,
+    e.g. "delete user {user_id}".
+    """
+    def decorator(method: _RepositoryMethod[_P, _R]) -> _RepositoryMethod[_P, _R]:
+        signature = inspect.signature(method)
+        
+        @functools.wraps(method)
+        async def wrapper(self: Any, *args: _P.args, **kwargs: _P.kwargs) -> _R:
+            try:
+                return await method(self, *args, **kwargs)
+            except Exception as e:
+                if rollback:
+                    await self.session.rollback()
+                logger.error(f"Failed to {_describe(action, signature, self, args, kwargs)}: {e}")
+                raise
+        return wrapper
+    return decorator
+
+
+def _describe(
+    action: str,
+    signature: inspect.Signature,
+    instance: Any,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any]
+) -> str:
+    """Fill action template with call arguments, falling back to the bare template"""
+    try:
+        bound = signature.bind(instance, *args, **kwargs)
+        bound.apply_defaults()
+        return action.format(**bound.arguments)
+    except (TypeError, AttributeError, KeyError, IndexError):
+        return action
+
 
 class UserRepositoryImpl(UserRepository):
     """SQLAlchemy implementation of user repository"""
@@ -27,151 +95,112 @@ class UserRepositoryImpl(UserRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
     
+    @_log_errors("create user", rollback=True)
     async def create(self, user: User) -> User:
         """Create a new user"""
-        try:
-            user_model = UserModel(
-                id=user.id.value,
-                email=user.email.value,
-                username=user.username,
-                password_hash=user.password_hash,
-                first_name=user.first_name,
-                last_name=user.last_name,
-                is_active=user.is_active,
-                is_verified=user.is_verified,
-                last_login=user.last_login,
-                created_at=user.created_at,
-                updated_at=user.updated_at
-            )
-            
-            self.session.add(user_model)
-            await self.session.commit()
-            await self.session.refresh(user_model)
-            
-            logger.info(f"Created user: {user.id.value}")
-            return self._model_to_entity(user_model)
-            
-        except Exception as e:
-            await self.session.rollback()
-            logger.error(f"Failed to create user: {e}")
-            raise
+        user_model = UserModel(
+            id=user.id.value,
+            email=user.email.value,
+            username=user.username,
+            password_hash=user.password_hash,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            is_active=user.is_active,
+            is_verified=user.is_verified,
+            last_login=user.last_login,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+            roles=[]
+        )
+        
+        self.session.add(user_model)
+        # Server-generated columns come back through INSERT ... RETURNING
+        await self.session.commit()
+        
+        logger.info(f"Created user: {user.id.value}")
+        return self._model_to_entity(user_model)
     
+    @_log_errors("get user by ID {user_id}")
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
         """Get user by ID"""
-        try:
-            stmt = (
-                select(UserModel)
-                .options(selectinload(UserModel.roles))
-                .where(UserModel.id == user_id)
-            )
-            
-            result = await self.session.execute(stmt)
-            user_model = result.scalar_one_or_none()
-            
-            if user_model:
-                return self._model_to_entity(user_model)
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Failed to get user by ID {user_id}: {e}")
-            raise
+        result = await self.session.execute(_GET_USER_BY_ID, {"id": user_id})
+        user_model = result.scalar_one_or_none()
+        
+        if user_model:
+            return self._model_to_entity(user_model)
+        
+        return None
     
+    @_log_errors("get user by email {email.value}")
     async def get_by_email(self, email: Email) -> Optional[User]:
         """Get user by email"""
-        try:
-            stmt = (
-                select(UserModel)
-                .options(selectinload(UserModel.roles))
-                .where(UserModel.email == email.value)
-            )
-            
-            result = await self.session.execute(stmt)
-            user_model = result.scalar_one_or_none()
-            
-            if user_model:
-                return self._model_to_entity(user_model)
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Failed to get user by email {email.value}: {e}")
-            raise
+        result = await self.session.execute(_GET_USER_BY_EMAIL, {"email": email.value})
+        user_model = result.scalar_one_or_none()
+        
+        if user_model:
+            return self._model_to_entity(user_model)
+        
+        return None
     
+    @_log_errors("get user by username {username}")
     async def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username"""
-        try:
-            stmt = (
-                select(UserModel)
-                .options(selectinload(UserModel.roles))
-                .where(UserModel.username == username)
-            )
-            
-            result = await self.session.execute(stmt)
-            user_model = result.scalar_one_or_none()
-            
-            if user_model:
-                return self._model_to_entity(user_model)
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Failed to get user by username {username}: {e}")
-            raise
+        result = await self.session.execute(_GET_USER_BY_USERNAME, {"username": username})
+        user_model = result.scalar_one_or_none()
+        
+        if user_model:
+            return self._model_to_entity(user_model)
+        
+        return None
     
+    @_log_errors("update user {user.id.value}", rollback=True)
     async def update(self, user: User) -> User:
         """Update existing user"""
-        try:
-            stmt = select(UserModel).where(UserModel.id == user.id.value)
-            result = await self.session.execute(stmt)
-            user_model = result.scalar_one_or_none()
-            
-            if not user_model:
-                raise ValueError(f"User not found: {user.id.value}")
-            
-            # Update fields
-            user_model.email = user.email.value
-            user_model.username = user.username
-            user_model.password_hash = user.password_hash
-            user_model.first_name = user.first_name
-            user_model.last_name = user.last_name
-            user_model.is_active = user.is_active
-            user_model.is_verified = user.is_verified
-            user_model.last_login = user.last_login
-            user_model.updated_at = user.updated_at
-            
-            await self.session.commit()
-            await self.session.refresh(user_model, ["roles"])
-            
-            logger.info(f"Updated user: {user.id.value}")
-            return self._model_to_entity(user_model)
-            
-        except Exception as e:
-            await self.session.rollback()
-            logger.error(f"Failed to update user {user.id.value}: {e}")
-            raise
+        # One UPDATE ... RETURNING; returned columns refresh any copy in the session
+        stmt = (
+            update(UserModel)
+            .where(UserModel.id == user.id.value)
+            .values(
+                email=user.email.value,
+                username=user.username,
+                password_hash=user.password_hash,
+                first_name=user.first_name,
+                last_name=user.last_name,
+                is_active=user.is_active,
+                is_verified=user.is_verified,
+                last_login=user.last_login,
+                updated_at=user.updated_at
+            )
+            .returning(UserModel)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        user_model = result.scalar_one_or_none()
+        
+        if not user_model:
+            raise ValueError(f"User not found: {user.id.value}")
+        
+        await self.session.commit()
+        
+        logger.info(f"Updated user: {user.id.value}")
+        return self._model_to_entity(user_model)
     
+    @_log_errors("delete user {user_id}", rollback=True)
     async def delete(self, user_id: UUID) -> bool:
         """Delete user by ID"""
-        try:
-            stmt = select(UserModel).where(UserModel.id == user_id)
-            result = await self.session.execute(stmt)
-            user_model = result.scalar_one_or_none()
-            
-            if not user_model:
-                return False
-            
-            await self.session.delete(user_model)
-            await self.session.commit()
-            
-            logger.info(f"Deleted user: {user_id}")
-            return True
-            
-        except Exception as e:
-            await self.session.rollback()
-            logger.error(f"Failed to delete user {user_id}: {e}")
-            raise
+        # Role assignments go with ON DELETE CASCADE
+        stmt = delete(UserModel).where(UserModel.id == user_id).returning(UserModel.id)
+        result = await self.session.execute(stmt)
+        deleted_id = result.scalar_one_or_none()
+        await self.session.commit()
+        
+        if deleted_id is None:
+            return False
+        
+        logger.info(f"Deleted user: {user_id}")
+        return True
     
+    @_log_errors("list users")
     async def list_users(
         self,
         skip: int = 0,
@@ -181,107 +210,104 @@ class UserRepositoryImpl(UserRepository):
         role: Optional[str] = None
     ) -> List[User]:
         """List users with optional filters"""
-        try:
-            stmt = select(UserModel).options(selectinload(UserModel.roles))
-            
-            # Apply filters
-            if is_active is not None:
-                stmt = stmt.where(UserModel.is_active == is_active)
-            
-            if is_verified is not None:
-                stmt = stmt.where(UserModel.is_verified == is_verified)
-            
-            if role:
-                stmt = stmt.join(UserModel.roles).where(
-                    UserModel.roles.any(name=role)
-                )
-            
-            # Apply pagination
-            stmt = stmt.offset(skip).limit(limit)
-            stmt = stmt.order_by(UserModel.created_at.desc())
-            
-            result = await self.session.execute(stmt)
-            user_models = result.scalars().all()
-            
-            return [self._model_to_entity(model) for model in user_models]
-            
-        except Exception as e:
-            logger.error(f"Failed to list users: {e}")
-            raise
+        stmt = (
+            select(UserModel)
+            .where(*self._filter_conditions(is_active, is_verified, role))
+            .offset(skip)
+            .limit(limit)
+            .order_by(UserModel.created_at.desc())
+        )
+        
+        result = await self.session.execute(stmt)
+        user_models = result.scalars().all()
+        
+        return [self._model_to_entity(model) for model in user_models]
+    
+    @_log_errors("list users")
+    async def list_users_paginated(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        is_verified: Optional[bool] = None,
+        role: Optional[str] = None
+    ) -> Tuple[List[User], int]:
+        """List users with optional filters, together with the total match count"""
+        conditions = self._filter_conditions(is_active, is_verified, role)
+        
+        # Total match count rides along as a window column
+        stmt = (
+            select(UserModel, func.count().over().label("total"))
+            .where(*conditions)
+            .offset(skip)
+            .limit(limit)
+            .order_by(UserModel.created_at.desc())
+        )
+        
+        result = await self.session.execute(stmt)
+        rows = result.all()
+        
+        if rows:
+            total = rows[0].total
+        elif skip:
+            # Page past the end: no row carries the total, count separately
+            count_stmt = select(func.count()).select_from(UserModel).where(*conditions)
+            total = (await self.session.execute(count_stmt)).scalar() or 0
+        else:
+            total = 0
+        
+        return [self._model_to_entity(row.UserModel) for row in rows], total
     
+    @_log_errors("count users")
     async def count_users(
         self,
         is_active: Optional[bool] = None,
         is_verified: Optional[bool] = None,
         role: Optional[str] = None
     ) -> int:
-        """Count users with optional filters"""
-        try:
-            stmt = select(func.count(UserModel.id))
-            
-            # Apply filters
-            if is_active is not None:
-                stmt = stmt.where(UserModel.is_active == is_active)
-            
-            if is_verified is not None:
-                stmt = stmt.where(UserModel.is_verified == is_verified)
-            
-            if role:
-                stmt = stmt.join(UserModel.roles).where(
-                    UserModel.roles.any(name=role)
-                )
-            
-            result = await self.session.execute(stmt)
-            return result.scalar()
-            
-        except Exception as e:
-            logger.error(f"Failed to count users: {e}")
-            raise
+        """Count users with optional filters.
+        
+        Deprecated: use list_users_paginated when a page is fetched as well.
+        """
+        warnings.warn(
+            "count_users is deprecated; use list_users_paginated",
+            DeprecationWarning,
+            stacklevel=3  # past the error-logging wrapper
+        )
+        stmt = select(func.count()).select_from(UserModel).where(
+            *self._filter_conditions(is_active, is_verified, role)
+        )
+        
+        result = await self.session.execute(stmt)
+        return result.scalar()
     
+    @_log_errors("check user existence by email {email.value}")
     async def exists_by_email(self, email: Email) -> bool:
         """Check if user exists by email"""
-        try:
-            stmt = select(func.count(UserModel.id)).where(UserModel.email == email.value)
-            result = await self.session.execute(stmt)
-            count = result.scalar()
-            return count > 0
-            
-        except Exception as e:
-            logger.error(f"Failed to check user existence by email {email.value}: {e}")
-            raise
+        result = await self.session.execute(_USER_EMAIL_EXISTS, {"email": email.value})
+        return bool(result.scalar())
     
+    @_log_errors("check user existence by username {username}")
     async def exists_by_username(self, username: str) -> bool:
         """Check if user exists by username"""
-        try:
-            stmt = select(func.count(UserModel.id)).where(UserModel.username == username)
-            result = await self.session.execute(stmt)
-            count = result.scalar()
-            return count > 0
-            
-        except Exception as e:
-            logger.error(f"Failed to check user existence by username {username}: {e}")
-            raise
+        result = await self.session.execute(_USER_USERNAME_EXISTS, {"username": username})
+        return bool(result.scalar())
     
+    @_log_errors("get users by role {role}")
     async def get_users_by_role(self, role: str) -> List[User]:
         """Get all users with specific role"""
-        try:
-            stmt = (
-                select(UserModel)
-                .options(selectinload(UserModel.roles))
-                .join(UserModel.roles)
-                .where(UserModel.roles.any(name=role))
-                .order_by(UserModel.created_at.desc())
-            )
-            
-            result = await self.session.execute(stmt)
-            user_models = result.scalars().all()
-            
-            return [self._model_to_entity(model) for model in user_models]
-            
-        except Exception as e:
-            logger.error(f"Failed to get users by role {role}: {e}")
-            raise
+        stmt = (
+            select(UserModel)
+            .where(UserModel.role_names_cache.contains([role]))
+            .order_by(UserModel.created_at.desc())
+            .execution_options(yield_per=_STREAM_BATCH_SIZE)
+        )
+        
+        # Unbounded: stream in batches so only one batch of models is alive at a time
+        result = await self.session.stream_scalars(stmt)
+        return [self._model_to_entity(model) async for model in result]
     
+    @_log_errors("search users with query '{query}'")
     async def search_users(
         self,
         query: str,
@@ -289,36 +315,43 @@ class UserRepositoryImpl(UserRepository):
         limit: int = 100
     ) -> List[User]:
         """Search users by name, username, or email"""
-        try:
-            search_term = f"%{query.lower()}%"
-            
-            stmt = (
-                select(UserModel)
-                .options(selectinload(UserModel.roles))
-                .where(
-                    or_(
-                        func.lower(UserModel.username).like(search_term),
-                        func.lower(UserModel.email).like(search_term),
-                        func.lower(UserModel.first_name).like(search_term),
-                        func.lower(UserModel.last_name).like(search_term),
-                        func.lower(
-                            func.concat(UserModel.first_name, ' ', UserModel.last_name)
-                        ).like(search_term)
-                    )
+        # One bound term for every column; display_name covers first, last and "first last"
+        search_term = bindparam("search_term", f"%{query}%")
+        
+        stmt = (
+            select(UserModel)
+            .where(
+                or_(
+                    UserModel.username.ilike(search_term),
+                    UserModel.email.ilike(search_term),
+                    UserModel.display_name.ilike(search_term)
                 )
-                .offset(skip)
-                .limit(limit)
-                .order_by(UserModel.created_at.desc())
             )
-            
-            result = await self.session.execute(stmt)
-            user_models = result.scalars().all()
-            
-            return [self._model_to_entity(model) for model in user_models]
-            
-        except Exception as e:
-            logger.error(f"Failed to search users with query '{query}': {e}")
-            raise
+            .offset(skip)
+            .limit(limit)
+            .order_by(UserModel.created_at.desc())
+        )
+        
+        result = await self.session.execute(stmt)
+        user_models = result.scalars().all()
+        
+        return [self._model_to_entity(model) for model in user_models]
+    
+    @staticmethod
+    def _filter_conditions(
+        is_active: Optional[bool],
+        is_verified: Optional[bool],
+        role: Optional[str]
+    ) -> list:
+        """Build WHERE conditions shared by the user list and count queries"""
+        conditions = []
+        if is_active is not None:
+            conditions.append(UserModel.is_active == is_active)
+        if is_verified is not None:
+            conditions.append(UserModel.is_verified == is_verified)
+        if role:
+            conditions.append(UserModel.role_names_cache.contains([role]))
+        return conditions
     
     def _model_to_entity(self, model: UserModel) -> User:
         """Convert UserModel to User entity"""
@@ -332,6 +365,7 @@ class UserRepositoryImpl(UserRepository):
             is_active=model.is_active,
             is_verified=model.is_verified,
             last_login=model.last_login,
+            # Read from users.role_names_cache, so no query needs to load UserModel.roles
             roles=model.role_names,
             created_at=model.created_at,
             updated_at=model.updated_at
@@ -1,24 +1,69 @@
 """
 Attribute repository implementation using SQLAlchemy
 """
-from typing import List, Optional, Dict, Any, Tuple
+import asyncio
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, and_, or_, func, desc, asc, delete, update
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy import Executable, Row, select, and_, or_, func, desc, asc, delete, update, bindparam, exists, lambda_stmt
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, selectinload, joinedload
 
 from ...domain.entities.attribute import Attribute, AttributeType
 from ...domain.repositories.attribute_repository import AttributeRepository
 from ...domain.value_objects.common import EntityId, Timestamps
 from ..database.models import AttributeModel, CategoryAttributeModel, ProductAttributeModel
 
+# Rows fetched per batch when streaming unbounded result sets
+_STREAM_BATCH_SIZE = 500
+
+# Extra pooled connections statistics queries may hold at once, across all requests
+_STATISTICS_CONNECTIONS = asyncio.Semaphore(6)
+
+# Hot lookups, built once and served from the compiled statement cache
+_GET_ATTRIBUTE_BY_ID = lambda_stmt(
+    lambda: select(AttributeModel).where(AttributeModel.id == bindparam("id"))
+)
+_GET_ATTRIBUTE_BY_NAME = lambda_stmt(
+    lambda: select(AttributeModel).where(AttributeModel.name == bindparam("name"))
+)
+_COUNT_PRODUCT_USAGES = lambda_stmt(
+    lambda: select(func.count()).select_from(ProductAttributeModel).where(
+        ProductAttributeModel.attribute_id == bindparam("attribute_id")
+    )
+)
+_COUNT_CATEGORY_USAGES = lambda_stmt(
+    lambda: select(func.count()).select_from(CategoryAttributeModel).where(
+        CategoryAttributeModel.attribute_id == bindparam("attribute_id")
+    )
+)
+_PRODUCT_USAGE_EXISTS = lambda_stmt(
+    lambda: select(exists().where(ProductAttributeModel.attribute_id == bindparam("attribute_id")))
+)
+_CATEGORY_USAGE_EXISTS = lambda_stmt(
+    lambda: select(exists().where(CategoryAttributeModel.attribute_id == bindparam("attribute_id")))
+)
+
+# Columns callers may sort by; anything else falls back to sort_order
+_SORT_COLUMNS: Dict[str, InstrumentedAttribute[Any]] = {
+    "display_order": AttributeModel.sort_order,
+    "sort_order": AttributeModel.sort_order,
+    "name": AttributeModel.name,
+    "slug": AttributeModel.slug,
+    "type": AttributeModel.type,
+    "created_at": AttributeModel.created_at,
+    "updated_at": AttributeModel.updated_at,
+}
+
 
 class SQLAlchemyAttributeRepository(AttributeRepository):
     """SQLAlchemy implementation of AttributeRepository"""
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, engine: AsyncEngine):
         self._session = session
+        # Statistics queries run side by side on their own connections
+        self._engine = engine
     
     async def create(self, attribute: Attribute) -> Attribute:
         """Create a new attribute"""
@@ -26,23 +71,19 @@ class SQLAlchemyAttributeRepository(AttributeRepository):
         self._session.add(model)
         await self._session.flush()
         await self._session.refresh(model)
-        return await self._model_to_entity(model)
+        return self._model_to_entity(model)
     
     async def get_by_id(self, attribute_id: EntityId) -> Optional[Attribute]:
         """Get attribute by ID"""
-        stmt = select(AttributeModel).where(AttributeModel.id == attribute_id.value)
-        
-        result = await self._session.execute(stmt)
+        result = await self._session.execute(_GET_ATTRIBUTE_BY_ID, {"id": attribute_id.value})
         model = result.scalar_one_or_none()
-        return await self._model_to_entity(model) if model else None
+        return self._model_to_entity(model) if model else None
     
     async def get_by_name(self, name: str) -> Optional[Attribute]:
         """Get attribute by name"""
-        stmt = select(AttributeModel).where(AttributeModel.name == name)
-        
-        result = await self._session.execute(stmt)
+        result = await self._session.execute(_GET_ATTRIBUTE_BY_NAME, {"name": name})
         model = result.scalar_one_or_none()
-        return await self._model_to_entity(model) if model else None
+        return self._model_to_entity(model) if model else None
     
     async def update(self, attribute: Attribute) -> Attribute:
         """Update an existing attribute"""
@@ -53,16 +94,16 @@ class SQLAlchemyAttributeRepository(AttributeRepository):
         self._update_model_from_entity(model, attribute)
         await self._session.flush()
         await self._session.refresh(model)
-        return await self._model_to_entity(model)
+        return self._model_to_entity(model)
     
     async def delete(self, attribute_id: EntityId) -> bool:
         """Delete attribute by ID"""
-        model = await self._session.get(AttributeModel, attribute_id.value)
-        if model:
-            await self._session.delete(model)
-            await self._session.flush()
-            return True
-        return False
+        # Category and product assignments go with ON DELETE CASCADE
+        stmt = delete(AttributeModel).where(
+            AttributeModel.id == attribute_id.value
+        ).returning(AttributeModel.id)
+        result = await self._session.execute(stmt)
+        return result.scalar_one_or_none() is not None
     
     async def list_with_filters(
         self,
@@ -100,22 +141,14 @@ class SQLAlchemyAttributeRepository(AttributeRepository):
                 )
             )
         
-        # Count total
-        count_stmt = select(func.count(AttributeModel.id))
-        if conditions:
-            count_stmt = count_stmt.where(and_(*conditions))
-        
-        count_result = await self._session.execute(count_stmt)
-        total = count_result.scalar() or 0
-        
-        # Get attributes
-        stmt = select(AttributeModel)
+        # Get attributes with the total match count as a window column
+        stmt = select(AttributeModel, func.count().over().label("total"))
         
         if conditions:
             stmt = stmt.where(and_(*conditions))
         
         # Sorting
-        sort_column = getattr(AttributeModel, sort_by, AttributeModel.display_order)
+        sort_column = _SORT_COLUMNS.get(sort_by, AttributeModel.sort_order)
         if sort_order.lower() == "desc":
             stmt = stmt.order_by(desc(sort_column))
         else:
@@ -126,18 +159,30 @@ class SQLAlchemyAttributeRepository(AttributeRepository):
         stmt = stmt.offset(offset).limit(size)
         
         result = await self._session.execute(stmt)
-        models = result.scalars().all()
-        attributes = [await self._model_to_entity(model) for model in models]
+        rows = result.all()
+        
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Page past the end: no row carries the total, count separately
+            count_stmt = select(func.count()).select_from(AttributeModel)
+            if conditions:
+                count_stmt = count_stmt.where(and_(*conditions))
+            total = (await self._session.execute(count_stmt)).scalar() or 0
+        else:
+            total = 0
+        
+        attributes = [self._model_to_entity(row.AttributeModel) for row in rows]
         
         return attributes, total
     
     async def get_all(self) -> List[Attribute]:
         """Get all attributes"""
-        stmt = select(AttributeModel).order_by(AttributeModel.display_order, AttributeModel.name)
+        stmt = select(AttributeModel).order_by(AttributeModel.sort_order, AttributeModel.name)
         
-        result = await self._session.execute(stmt)
-        models = result.scalars().all()
-        return [await self._model_to_entity(model) for model in models]
+        # Unbounded: stream in batches so only one batch of models is alive at a time
+        result = await self._session.stream_scalars(stmt.execution_options(yield_per=_STREAM_BATCH_SIZE))
+        return [self._model_to_entity(model) async for model in result]
     
     async def get_by_category(self, category_id: EntityId) -> List[Attribute]:
         """Get attributes assigned to a category"""
@@ -147,14 +192,13 @@ class SQLAlchemyAttributeRepository(AttributeRepository):
         ).where(
             CategoryAttributeModel.category_id == category_id.value
         ).order_by(
-            CategoryAttributeModel.display_order,
-            AttributeModel.display_order,
+            CategoryAttributeModel.sort_order,
+            AttributeModel.sort_order,
             AttributeModel.name
         )
         
-        result = await self._session.execute(stmt)
-        models = result.scalars().all()
-        return [await self._model_to_entity(model) for model in models]
+        result = await self._session.stream_scalars(stmt.execution_options(yield_per=_STREAM_BATCH_SIZE))
+        return [self._model_to_entity(model) async for model in result]
     
     async def assign_to_category(
         self,
@@ -163,30 +207,26 @@ class SQLAlchemyAttributeRepository(AttributeRepository):
         inherit_to_children: bool = False
     ) -> List[Any]:  # CategoryAttribute entity would be defined
         """Assign attributes to a category"""
-        assignments = []
-        
-        for i, attribute_id in enumerate(attribute_ids):
-            # Check if assignment already exists
-            existing_stmt = select(CategoryAttributeModel).where(
-                and_(
-                    CategoryAttributeModel.category_id == category_id.value,
-                    CategoryAttributeModel.attribute_id == attribute_id.value
-                )
-            )
-            existing_result = await self._session.execute(existing_stmt)
-            existing = existing_result.scalar_one_or_none()
-            
-            if not existing:
-                assignment = CategoryAttributeModel(
-                    category_id=category_id.value,
-                    attribute_id=attribute_id.value,
-                    is_inherited=False,
-                    display_order=i
-                )
-                self._session.add(assignment)
-                assignments.append(assignment)
-        
-        await self._session.flush()
+        rows = [
+            {
+                "category_id": category_id.value,
+                "attribute_id": attribute_id.value,
+                "sort_order": i
+            }
+            for i, attribute_id in enumerate(attribute_ids)
+        ]
+        if not rows:
+            return []
+        
+        # One multi-row INSERT; pairs already assigned are skipped by the
+        # unique (category_id, attribute_id) index, so no existence pre-check
+        stmt = (
+            pg_insert(CategoryAttributeModel)
+            .on_conflict_do_nothing(index_elements=["category_id", "attribute_id"])
+            .returning(CategoryAttributeModel)
+        )
+        result = await self._session.execute(stmt, rows)
+        assignments = list(result.scalars())
         
         # TODO: Handle inherit_to_children logic
         # This would require getting child categories and creating assignments
@@ -195,75 +235,74 @@ class SQLAlchemyAttributeRepository(AttributeRepository):
     
     async def get_usage_count(self, attribute_id: EntityId) -> int:
         """Get number of products using this attribute"""
-        stmt = select(func.count(ProductAttributeModel.id)).where(
-            ProductAttributeModel.attribute_id == attribute_id.value
+        result = await self._session.execute(
+            _COUNT_PRODUCT_USAGES, {"attribute_id": attribute_id.value}
         )
-        
-        result = await self._session.execute(stmt)
         return result.scalar() or 0
     
     async def get_categories_count(self, attribute_id: EntityId) -> int:
         """Get number of categories using this attribute"""
-        stmt = select(func.count(CategoryAttributeModel.id)).where(
-            CategoryAttributeModel.attribute_id == attribute_id.value
+        result = await self._session.execute(
+            _COUNT_CATEGORY_USAGES, {"attribute_id": attribute_id.value}
         )
-        
-        result = await self._session.execute(stmt)
         return result.scalar() or 0
     
+    async def is_in_use(self, attribute_id: EntityId) -> bool:
+        """Check if any product uses this attribute"""
+        # EXISTS stops at the first matching row instead of counting them all
+        result = await self._session.execute(
+            _PRODUCT_USAGE_EXISTS, {"attribute_id": attribute_id.value}
+        )
+        return bool(result.scalar())
+    
+    async def is_assigned_to_any_category(self, attribute_id: EntityId) -> bool:
+        """Check if any category has this attribute assigned"""
+        result = await self._session.execute(
+            _CATEGORY_USAGE_EXISTS, {"attribute_id": attribute_id.value}
+        )
+        return bool(result.scalar())
+    
     async def get_statistics(self) -> Dict[str, Any]:
         """Get attribute statistics"""
-        # Total attributes
-        total_stmt = select(func.count(AttributeModel.id))
-        total_result = await self._session.execute(total_stmt)
-        total = total_result.scalar() or 0
+        # Total and flag counts in one pass
+        counts_stmt = select(
+            func.count(),
+            func.count().filter(AttributeModel.is_required == True),
+            func.count().filter(AttributeModel.is_filterable == True),
+            func.count().filter(AttributeModel.is_searchable == True)
+        ).select_from(AttributeModel)
         
         # Attributes by type
         type_stmt = select(
             AttributeModel.type,
-            func.count(AttributeModel.id)
+            func.count()
         ).group_by(AttributeModel.type)
         
-        type_result = await self._session.execute(type_stmt)
-        type_counts = {row[0].value: row[1] for row in type_result.fetchall()}
-        
-        # Required attributes
-        required_stmt = select(func.count(AttributeModel.id)).where(
-            AttributeModel.is_required == True
-        )
-        required_result = await self._session.execute(required_stmt)
-        required_count = required_result.scalar() or 0
-        
-        # Filterable attributes
-        filterable_stmt = select(func.count(AttributeModel.id)).where(
-            AttributeModel.is_filterable == True
-        )
-        filterable_result = await self._session.execute(filterable_stmt)
-        filterable_count = filterable_result.scalar() or 0
-        
-        # Searchable attributes
-        searchable_stmt = select(func.count(AttributeModel.id)).where(
-            AttributeModel.is_searchable == True
-        )
-        searchable_result = await self._session.execute(searchable_stmt)
-        searchable_count = searchable_result.scalar() or 0
-        
         # Most used attributes
+        # Counting attribute_id lets the join be answered from ix_product_attributes_attribute
         most_used_stmt = select(
             AttributeModel.name,
-            func.count(ProductAttributeModel.id).label('usage_count')
-        ).select_from(
-            AttributeModel.__table__.outerjoin(ProductAttributeModel.__table__)
+            func.count(ProductAttributeModel.attribute_id).label('usage_count')
+        ).outerjoin(
+            AttributeModel.product_attributes
         ).group_by(
             AttributeModel.id, AttributeModel.name
         ).order_by(
             desc('usage_count')
         ).limit(10)
         
-        most_used_result = await self._session.execute(most_used_stmt)
+        # The queries are independent read-only aggregates, so run them side by side
+        counts_rows, type_rows, most_used_rows = await asyncio.gather(
+            self._fetch_all(counts_stmt),
+            self._fetch_all(type_stmt),
+            self._fetch_all(most_used_stmt)
+        )
+        
+        total, required_count, filterable_count, searchable_count = counts_rows[0]
+        type_counts = {row[0].value: row[1] for row in type_rows}
         most_used = [
             {'name': row[0], 'usage_count': row[1]}
-            for row in most_used_result.fetchall()
+            for row in most_used_rows
         ]
         
         return {
@@ -275,6 +314,17 @@ class SQLAlchemyAttributeRepository(AttributeRepository):
             'most_used': most_used
         }
     
+    async def _fetch_all(self, stmt: Executable) -> Sequence[Row[Any]]:
+        """Run a read-only statement on its own pooled connection.
+        
+        The session's connection can only run one statement at a time; sees
+        committed data only.
+        """
+        async with _STATISTICS_CONNECTIONS:
+            async with self._engine.connect() as connection:
+                result = await connection.execute(stmt)
+                return result.all()
+    
     def _create_model_from_entity(self, attribute: Attribute) -> AttributeModel:
         """Create database model from domain entity"""
         return AttributeModel(
@@ -307,7 +357,7 @@ class SQLAlchemyAttributeRepository(AttributeRepository):
         model.group_name = attribute.group_name
         model.updated_at = attribute.timestamps.updated_at
     
-    async def _model_to_entity(self, model: AttributeModel) -> Attribute:
+    def _model_to_entity(self, model: AttributeModel) -> Attribute:
         """Convert database model to domain entity"""
         return Attribute(
             id=EntityId(model.id),
@@ -4,14 +4,15 @@ Category repository implementation using SQLAlchemy
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, exists, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer_group
 
 from ...domain.entities.category import Category
 from ...domain.repositories.category import CategoryRepository
 from ...domain.value_objects.common import Slug
-from ..database.models import CategoryModel
+from ..database.models import CategoryModel, SEARCH_CONFIG
 
 
 class SQLAlchemyCategoryRepository(CategoryRepository):
@@ -22,67 +23,62 @@ class SQLAlchemyCategoryRepository(CategoryRepository):
     
     async def save(self, category: Category) -> Category:
         """Save category to database"""
-        # Check if category exists
-        existing = await self._session.get(CategoryModel, category.id)
+        values = {
+            "id": category.id,
+            "name": category.name,
+            "slug": str(category.slug),
+            "description": category.description,
+            "path": category.path,
+            "meta_title": category.meta_title,
+            "meta_description": category.meta_description,
+            "meta_keywords": category.meta_keywords,
+            "is_active": category.is_active,
+            "sort_order": category.sort_order,
+        }
         
-        if existing:
-            # Update existing category
-            existing.name = category.name
-            existing.slug = str(category.slug)
-            existing.description = category.description
-            existing.path = category.path
-            existing.meta_title = category.meta_title
-            existing.meta_description = category.meta_description
-            existing.meta_keywords = category.meta_keywords
-            existing.is_active = category.is_active
-            existing.sort_order = category.sort_order
-            model = existing
-        else:
-            # Create new category
-            model = CategoryModel(
-                id=category.id,
-                name=category.name,
-                slug=str(category.slug),
-                description=category.description,
-                path=category.path,
-                meta_title=category.meta_title,
-                meta_description=category.meta_description,
-                meta_keywords=category.meta_keywords,
-                is_active=category.is_active,
-                sort_order=category.sort_order
-            )
-            self._session.add(model)
+        # Insert or update in one statement; RETURNING also refreshes any copy
+        # of the row already in the session
+        stmt = pg_insert(CategoryModel).values(**values)
+        upsert = stmt.on_conflict_do_update(
+            index_elements=["id"],
+            set_={
+                **{column: stmt.excluded[column] for column in values if column != "id"},
+                "updated_at": func.now(),
+            }
+        ).returning(CategoryModel).options(
+            undefer_group("seo")
+        ).execution_options(populate_existing=True)
         
-        await self._session.flush()
-        return self._model_to_entity(model)
+        result = await self._session.execute(upsert)
+        return self._model_to_entity(result.scalar_one())
     
     async def find_by_id(self, category_id: UUID) -> Optional[Category]:
         """Find category by ID"""
-        model = await self._session.get(CategoryModel, category_id)
+        model = await self._session.get(CategoryModel, category_id, options=[undefer_group("seo")])
         return self._model_to_entity(model) if model else None
     
     async def find_by_slug(self, slug: Slug) -> Optional[Category]:
         """Find category by slug"""
-        stmt = select(CategoryModel).where(CategoryModel.slug == str(slug))
+        stmt = select(CategoryModel).options(undefer_group("seo")).where(CategoryModel.slug == str(slug))
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
         return self._model_to_entity(model) if model else None
     
     async def find_by_path(self, path: str) -> Optional[Category]:
         """Find category by path"""
-        stmt = select(CategoryModel).where(CategoryModel.path == path)
+        stmt = select(CategoryModel).options(undefer_group("seo")).where(CategoryModel.path == path)
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
         return self._model_to_entity(model) if model else None
     
     async def find_children(self, parent_path: str) -> List[Category]:
         """Find direct children of a category"""
-        # Find categories where path starts with parent_path + "."
-        # and has exactly one more level
-        stmt = select(CategoryModel).where(
+        # Paths under parent_path with exactly one more label; the path is
+        # bound as an ltree value rather than spliced into an lquery pattern
+        stmt = select(CategoryModel).options(undefer_group("seo")).where(
             and_(
-                CategoryModel.path.like(f"{parent_path}.%"),
-                ~CategoryModel.path.like(f"{parent_path}.%.%")
+                CategoryModel.path.descendant_of(parent_path),
+                func.nlevel(CategoryModel.path) == parent_path.count(".") + 2
             )
         ).order_by(CategoryModel.sort_order, CategoryModel.name)
         
@@ -92,8 +88,11 @@ class SQLAlchemyCategoryRepository(CategoryRepository):
     
     async def find_descendants(self, parent_path: str) -> List[Category]:
         """Find all descendants of a category"""
-        stmt = select(CategoryModel).where(
-            CategoryModel.path.like(f"{parent_path}.%")
+        stmt = select(CategoryModel).options(undefer_group("seo")).where(
+            and_(
+                CategoryModel.path.descendant_of(parent_path),
+                CategoryModel.path != parent_path
+            )
         ).order_by(CategoryModel.path, CategoryModel.sort_order)
         
         result = await self._session.execute(stmt)
@@ -102,7 +101,7 @@ class SQLAlchemyCategoryRepository(CategoryRepository):
     
     async def find_active(self) -> List[Category]:
         """Find all active categories"""
-        stmt = select(CategoryModel).where(
+        stmt = select(CategoryModel).options(undefer_group("seo")).where(
             CategoryModel.is_active == True
         ).order_by(CategoryModel.path, CategoryModel.sort_order)
         
@@ -112,8 +111,8 @@ class SQLAlchemyCategoryRepository(CategoryRepository):
     
     async def find_root_categories(self) -> List[Category]:
         """Find root categories (no parent)"""
-        stmt = select(CategoryModel).where(
-            ~CategoryModel.path.contains(".")
+        stmt = select(CategoryModel).options(undefer_group("seo")).where(
+            func.nlevel(CategoryModel.path) == 1
         ).order_by(CategoryModel.sort_order, CategoryModel.name)
         
         result = await self._session.execute(stmt)
@@ -123,16 +122,13 @@ class SQLAlchemyCategoryRepository(CategoryRepository):
     async def search(self, query: str, active_only: bool = True) -> List[Category]:
         """Search categories by name or description"""
         conditions = [
-            or_(
-                CategoryModel.name.ilike(f"%{query}%"),
-                CategoryModel.description.ilike(f"%{query}%")
-            )
+            CategoryModel.search_vector.match(query, postgresql_regconfig=SEARCH_CONFIG)
         ]
         
         if active_only:
             conditions.append(CategoryModel.is_active == True)
         
-        stmt = select(CategoryModel).where(
+        stmt = select(CategoryModel).options(undefer_group("seo")).where(
             and_(*conditions)
         ).order_by(CategoryModel.path, CategoryModel.sort_order)
         
@@ -156,9 +152,8 @@ class SQLAlchemyCategoryRepository(CategoryRepository):
         if exclude_id:
             conditions.append(CategoryModel.id != exclude_id)
         
-        stmt = select(CategoryModel.id).where(and_(*conditions))
-        result = await self._session.execute(stmt)
-        return result.scalar_one_or_none() is not None
+        stmt = select(exists().where(and_(*conditions)))
+        return bool(await self._session.scalar(stmt))
     
     def _model_to_entity(self, model: CategoryModel) -> Category:
         """Convert database model to domain entity"""
@@ -169,8 +164,9 @@ class SQLAlchemyCategoryRepository(CategoryRepository):
             description=model.description,
             path=model.path,
             meta_title=model.meta_title,
-            meta_description=model.meta_description,
-            meta_keywords=model.meta_keywords,
+            # Deferred columns: only present when the query undeferred them
+            meta_description=model.__dict__.get("meta_description"),
+            meta_keywords=model.__dict__.get("meta_keywords"),
             is_active=model.is_active,
             sort_order=model.sort_order,
             created_at=model.created_at,
@@ -5,15 +5,90 @@ from decimal import Decimal
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, and_, or_, func, desc, asc, delete, update
+from cachetools import TTLCache
+from sqlalchemy import ColumnElement, select, and_, or_, exists, func, desc, asc, delete, update, literal, literal_column, tuple_, event
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.orm import InstrumentedAttribute, ORMExecuteState, Session, selectinload, joinedload, undefer_group
 
 from ...domain.entities.product import Product, ProductStatus
 from ...domain.repositories.product_repository import ProductRepository
 from ...domain.value_objects.common import EntityId, Money, SEOData, Timestamps
 from ...domain.value_objects.product import SKU, ProductImages
-from ..database.models import ProductModel, CategoryModel, ProductAttributeModel
+from ..database.models import (
+    ProductModel, CategoryModel, ProductAttributeModel, ProductImageModel,
+    SEARCH_CONFIG, price_from_minor_units, price_to_minor_units
+)
+
+# Single-product reads: the category rides along on the one product row,
+# attributes (with their definitions) and images come from one IN query each
+_PRODUCT_LOAD_OPTIONS = (
+    joinedload(ProductModel.category),
+    selectinload(ProductModel.product_attributes).selectinload(ProductAttributeModel.attribute),
+    selectinload(ProductModel.images),
+)
+
+# Product lists: only what list entities are built from. Categories come from
+# one IN query instead of widening every row; attributes are not loaded
+_PRODUCT_LIST_LOAD_OPTIONS = (
+    selectinload(ProductModel.category),
+    selectinload(ProductModel.images),
+)
+
+# Process-wide SKU -> product cache for detail lookups; writes through this
+# repository evict their SKUs once committed, other workers' writes show up within the TTL
+_SKU_CACHE_SIZE = 10_000
+_SKU_CACHE_TTL = 60
+_SKU_CACHE: TTLCache[str, Product] = TTLCache(maxsize=_SKU_CACHE_SIZE, ttl=_SKU_CACHE_TTL)
+
+# Session.info keys: whether the transaction has written, and SKUs to evict when it commits
+_WRITES_INFO_KEY = "product_sku_cache_writes"
+_EVICT_INFO_KEY = "product_sku_cache_evict"
+
+
+def _mark_flush_writes(session: Session, flush_context: Any) -> None:
+    """Record that the session flushed changes in its current transaction"""
+    session.info[_WRITES_INFO_KEY] = True
+
+
+def _mark_statement_writes(orm_execute_state: ORMExecuteState) -> None:
+    """Record that the session executed a statement that may write"""
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_WRITES_INFO_KEY] = True
+
+
+def _evict_committed_skus(session: Session) -> None:
+    """Evict SKUs written by the committed transaction from the shared cache"""
+    for sku in session.info.pop(_EVICT_INFO_KEY, ()):
+        _SKU_CACHE.pop(sku, None)
+    session.info.pop(_WRITES_INFO_KEY, None)
+
+
+def _discard_pending_skus(session: Session) -> None:
+    """Forget write tracking for a rolled back transaction; the cache never saw it"""
+    session.info.pop(_EVICT_INFO_KEY, None)
+    session.info.pop(_WRITES_INFO_KEY, None)
+
+
+def _track_sku_cache_writes(session: Session) -> None:
+    """Attach SKU cache bookkeeping to a session, once per session"""
+    if event.contains(session, "after_commit", _evict_committed_skus):
+        return
+    event.listen(session, "after_flush", _mark_flush_writes)
+    event.listen(session, "do_orm_execute", _mark_statement_writes)
+    event.listen(session, "after_commit", _evict_committed_skus)
+    event.listen(session, "after_rollback", _discard_pending_skus)
+
+# Columns callers may sort by; anything else falls back to created_at
+_SORT_COLUMNS: Dict[str, InstrumentedAttribute[Any]] = {
+    "name": ProductModel.name,
+    "sku": ProductModel.sku,
+    "price": ProductModel.price,
+    "status": ProductModel.status,
+    "sort_order": ProductModel.sort_order,
+    "inventory_quantity": ProductModel.inventory_quantity,
+    "created_at": ProductModel.created_at,
+    "updated_at": ProductModel.updated_at,
+}
 
 
 class SQLAlchemyProductRepository(ProductRepository):
@@ -21,52 +96,77 @@ class SQLAlchemyProductRepository(ProductRepository):
     
     def __init__(self, session: AsyncSession):
         self._session = session
+        # Only sessions used for products pay for the cache bookkeeping
+        _track_sku_cache_writes(session.sync_session)
     
     async def create(self, product: Product) -> Product:
         """Create a new product"""
         model = self._create_model_from_entity(product)
         self._session.add(model)
         await self._session.flush()
-        await self._session.refresh(model)
-        return await self._model_to_entity(model)
+        # Images stay loaded as set from the entity
+        await self._session.refresh(model, ["created_at", "updated_at"])
+        return self._model_to_entity(model)
     
     async def get_by_id(self, product_id: EntityId) -> Optional[Product]:
         """Get product by ID"""
         stmt = select(ProductModel).options(
-            joinedload(ProductModel.category),
-            selectinload(ProductModel.product_attributes)
+            *_PRODUCT_LOAD_OPTIONS,
+            undefer_group("seo")
         ).where(ProductModel.id == product_id.value)
         
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
-        return await self._model_to_entity(model) if model else None
+        return self._model_to_entity(model) if model else None
     
     async def get_by_sku(self, sku: SKU) -> Optional[Product]:
         """Get product by SKU"""
+        # A transaction that has written reads its own rows, never the shared cache
+        use_cache = not self._has_pending_writes()
+        cached = _SKU_CACHE.get(sku.value) if use_cache else None
+        if cached is not None:
+            # Entities are mutable; callers get their own copy
+            return cached.model_copy(deep=True)
+        
         stmt = select(ProductModel).options(
-            joinedload(ProductModel.category),
-            selectinload(ProductModel.product_attributes)
+            *_PRODUCT_LOAD_OPTIONS,
+            undefer_group("seo")
         ).where(ProductModel.sku == sku.value)
         
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
-        return await self._model_to_entity(model) if model else None
+        if not model:
+            return None
+        
+        product = self._model_to_entity(model)
+        if use_cache:
+            _SKU_CACHE[sku.value] = product.model_copy(deep=True)
+        return product
+    
+    async def exists_by_sku(self, sku: SKU) -> bool:
+        """Check if product with SKU exists"""
+        stmt = select(exists().where(ProductModel.sku == sku.value))
+        return bool(await self._session.scalar(stmt))
     
     async def update(self, product: Product) -> Product:
         """Update an existing product"""
-        model = await self._session.get(ProductModel, product.id.value)
+        model = await self._session.get(
+            ProductModel, product.id.value, options=[selectinload(ProductModel.images)]
+        )
         if not model:
             raise ValueError(f"Product with ID {product.id.value} not found")
         
+        self._evict_on_commit(model.sku, product.sku.value)
         self._update_model_from_entity(model, product)
         await self._session.flush()
-        await self._session.refresh(model)
-        return await self._model_to_entity(model)
+        await self._session.refresh(model, ["created_at", "updated_at"])
+        return self._model_to_entity(model)
     
     async def delete(self, product_id: EntityId) -> bool:
         """Delete product by ID"""
         model = await self._session.get(ProductModel, product_id.value)
         if model:
+            self._evict_on_commit(model.sku)
             await self._session.delete(model)
             await self._session.flush()
             return True
@@ -93,25 +193,18 @@ class SQLAlchemyProductRepository(ProductRepository):
         if 'price_range' in filters:
             price_range = filters['price_range']
             if 'min' in price_range:
-                conditions.append(ProductModel.price >= price_range['min'])
+                conditions.append(ProductModel.price >= price_to_minor_units(price_range['min']))
             if 'max' in price_range:
-                conditions.append(ProductModel.price <= price_range['max'])
+                conditions.append(ProductModel.price <= price_to_minor_units(price_range['max']))
         
         if 'search' in filters:
-            search_term = f"%{filters['search']}%"
-            conditions.append(
-                or_(
-                    ProductModel.name.ilike(search_term),
-                    ProductModel.description.ilike(search_term),
-                    ProductModel.sku.ilike(search_term)
-                )
-            )
+            conditions.append(self._text_condition(filters['search']))
         
         if 'sku' in filters:
             conditions.append(ProductModel.sku == filters['sku'])
         
         # Count total
-        count_stmt = select(func.count(ProductModel.id))
+        count_stmt = select(func.count()).select_from(ProductModel)
         if conditions:
             count_stmt = count_stmt.where(and_(*conditions))
         
@@ -120,15 +213,14 @@ class SQLAlchemyProductRepository(ProductRepository):
         
         # Get products
         stmt = select(ProductModel).options(
-            joinedload(ProductModel.category),
-            selectinload(ProductModel.product_attributes)
+            *_PRODUCT_LIST_LOAD_OPTIONS
         )
         
         if conditions:
             stmt = stmt.where(and_(*conditions))
         
         # Sorting
-        sort_column = getattr(ProductModel, sort_by, ProductModel.created_at)
+        sort_column = _SORT_COLUMNS.get(sort_by, ProductModel.created_at)
         if sort_order.lower() == "desc":
             stmt = stmt.order_by(desc(sort_column))
         else:
@@ -140,7 +232,7 @@ class SQLAlchemyProductRepository(ProductRepository):
         
         result = await self._session.execute(stmt)
         models = result.scalars().all()
-        products = [await self._model_to_entity(model) for model in models]
+        products = [self._model_to_entity(model) for model in models]
         
         return products, total
     
@@ -150,21 +242,19 @@ class SQLAlchemyProductRepository(ProductRepository):
         page: int = 1,
         size: int = 20,
         sort_by: str = "relevance",
-        sort_order: str = "desc"
+        sort_order: str = "desc",
+        after: Optional[Tuple[Any, UUID]] = None
     ) -> Tuple[List[Product], int]:
-        """Advanced product search"""
+        """Advanced product search.
+        
+        With after=(sort value, id) of the last product seen, the page starts
+        right after it (keyset pagination) and page is ignored.
+        """
         conditions = []
         
         # Text search
         if 'query' in criteria:
-            search_term = f"%{criteria['query']}%"
-            conditions.append(
-                or_(
-                    ProductModel.name.ilike(search_term),
-                    ProductModel.description.ilike(search_term),
-                    ProductModel.sku.ilike(search_term)
-                )
-            )
+            conditions.append(self._text_condition(criteria['query']))
         
         # Category filter
         if 'category_ids' in criteria:
@@ -175,17 +265,22 @@ class SQLAlchemyProductRepository(ProductRepository):
         if 'price_range' in criteria:
             price_range = criteria['price_range']
             if 'min' in price_range:
-                conditions.append(ProductModel.price >= price_range['min'])
+                conditions.append(ProductModel.price >= price_to_minor_units(price_range['min']))
             if 'max' in price_range:
-                conditions.append(ProductModel.price <= price_range['max'])
+                conditions.append(ProductModel.price <= price_to_minor_units(price_range['max']))
         
         # Status filter
         if 'status' in criteria:
             status_list = criteria['status']
             conditions.append(ProductModel.status.in_(status_list))
         
+        # Attribute filters, keyed by attribute ID
+        if 'attributes' in criteria:
+            for attribute_id, value in criteria['attributes'].items():
+                conditions.append(self._attribute_condition(attribute_id, value))
+        
         # Count total
-        count_stmt = select(func.count(ProductModel.id))
+        count_stmt = select(func.count()).select_from(ProductModel)
         if conditions:
             count_stmt = count_stmt.where(and_(*conditions))
         
@@ -194,30 +289,31 @@ class SQLAlchemyProductRepository(ProductRepository):
         
         # Get products
         stmt = select(ProductModel).options(
-            joinedload(ProductModel.category),
-            selectinload(ProductModel.product_attributes)
+            *_PRODUCT_LIST_LOAD_OPTIONS
         )
         
         if conditions:
             stmt = stmt.where(and_(*conditions))
         
-        # Sorting (simplified for now)
+        # Sorting (simplified for now); id breaks ties so keyset pages are stable
         if sort_by == "relevance":
-            stmt = stmt.order_by(ProductModel.name)
+            sort_column, descending = ProductModel.name, False
         else:
-            sort_column = getattr(ProductModel, sort_by, ProductModel.created_at)
-            if sort_order.lower() == "desc":
-                stmt = stmt.order_by(desc(sort_column))
-            else:
-                stmt = stmt.order_by(asc(sort_column))
+            sort_column = _SORT_COLUMNS.get(sort_by, ProductModel.created_at)
+            descending = sort_order.lower() == "desc"
+        direction = desc if descending else asc
+        stmt = stmt.order_by(direction(sort_column), direction(ProductModel.id))
         
         # Pagination
-        offset = (page - 1) * size
-        stmt = stmt.offset(offset).limit(size)
+        if after is not None:
+            stmt = stmt.where(self._keyset_condition(sort_column, descending, after))
+        else:
+            stmt = stmt.offset((page - 1) * size)
+        stmt = stmt.limit(size)
         
         result = await self._session.execute(stmt)
         models = result.scalars().all()
-        products = [await self._model_to_entity(model) for model in models]
+        products = [self._model_to_entity(model) for model in models]
         
         return products, total
     
@@ -226,23 +322,67 @@ class SQLAlchemyProductRepository(ProductRepository):
         category_id_values = [cid.value for cid in category_ids]
         
         stmt = select(ProductModel).options(
-            joinedload(ProductModel.category),
-            selectinload(ProductModel.product_attributes)
+            *_PRODUCT_LIST_LOAD_OPTIONS
         ).where(ProductModel.category_id.in_(category_id_values))
         
         result = await self._session.execute(stmt)
         models = result.scalars().all()
-        return [await self._model_to_entity(model) for model in models]
+        return [self._model_to_entity(model) for model in models]
+    
+    async def find_by_category(
+        self,
+        category_id: EntityId,
+        include_descendants: bool = False,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[int, UUID]] = None
+    ) -> List[Product]:
+        """Get products in a category, optionally including all its subcategories.
+        
+        Products come in (sort_order, id) order; after=(sort_order, id) of the
+        last product seen continues from there.
+        """
+        if include_descendants:
+            # Subtree resolved inside the same statement: categories whose path
+            # lies under the parent's path, matched through the GiST index
+            parent_path = (
+                select(CategoryModel.path)
+                .where(CategoryModel.id == category_id.value)
+                .scalar_subquery()
+            )
+            category_filter = ProductModel.category_id.in_(
+                select(CategoryModel.id).where(CategoryModel.path.descendant_of(parent_path))
+            )
+        else:
+            category_filter = ProductModel.category_id == category_id.value
+        
+        stmt = (
+            select(ProductModel)
+            .options(*_PRODUCT_LIST_LOAD_OPTIONS)
+            .where(category_filter)
+            .order_by(ProductModel.sort_order, ProductModel.id)
+        )
+        if after is not None:
+            stmt = stmt.where(self._keyset_condition(ProductModel.sort_order, False, after))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        
+        result = await self._session.execute(stmt)
+        models = result.scalars().all()
+        return [self._model_to_entity(model) for model in models]
     
     async def bulk_delete(self, product_ids: List[EntityId]) -> int:
         """Bulk delete products"""
         product_id_values = [pid.value for pid in product_ids]
         
-        stmt = delete(ProductModel).where(ProductModel.id.in_(product_id_values))
+        stmt = delete(ProductModel).where(
+            ProductModel.id.in_(product_id_values)
+        ).returning(ProductModel.sku)
         result = await self._session.execute(stmt)
+        deleted_skus = result.scalars().all()
+        self._evict_on_commit(*deleted_skus)
         await self._session.flush()
         
-        return result.rowcount
+        return len(deleted_skus)
     
     async def bulk_update_status(self, product_ids: List[EntityId], status: ProductStatus) -> int:
         """Bulk update product status"""
@@ -250,24 +390,26 @@ class SQLAlchemyProductRepository(ProductRepository):
         
         stmt = update(ProductModel).where(
             ProductModel.id.in_(product_id_values)
-        ).values(status=status)
+        ).values(status=status).returning(ProductModel.sku)
         
         result = await self._session.execute(stmt)
+        updated_skus = result.scalars().all()
+        self._evict_on_commit(*updated_skus)
         await self._session.flush()
         
-        return result.rowcount
+        return len(updated_skus)
     
     async def get_statistics(self) -> Dict[str, Any]:
         """Get product statistics"""
         # Total products
-        total_stmt = select(func.count(ProductModel.id))
+        total_stmt = select(func.count()).select_from(ProductModel)
         total_result = await self._session.execute(total_stmt)
         total = total_result.scalar() or 0
         
         # Products by status
         status_stmt = select(
             ProductModel.status,
-            func.count(ProductModel.id)
+            func.count()
         ).group_by(ProductModel.status)
         
         status_result = await self._session.execute(status_stmt)
@@ -276,7 +418,7 @@ class SQLAlchemyProductRepository(ProductRepository):
         # Products by category
         category_stmt = select(
             CategoryModel.name,
-            func.count(ProductModel.id)
+            func.count()
         ).select_from(
             ProductModel.__table__.join(CategoryModel.__table__)
         ).group_by(CategoryModel.name)
@@ -301,12 +443,26 @@ class SQLAlchemyProductRepository(ProductRepository):
             'archived': status_counts.get('archived', 0),
             'by_category': category_counts,
             'price_range': {
-                'min': price_stats[0] if price_stats[0] else 0,
-                'max': price_stats[1] if price_stats[1] else 0
+                'min': price_from_minor_units(price_stats[0]) if price_stats[0] else 0,
+                'max': price_from_minor_units(price_stats[1]) if price_stats[1] else 0
             },
-            'average_price': price_stats[2] if price_stats[2] else None
+            'average_price': price_from_minor_units(price_stats[2]) if price_stats[2] else None
         }
     
+    def _has_pending_writes(self) -> bool:
+        """Check whether the current transaction has unflushed or uncommitted writes"""
+        session = self._session
+        return bool(
+            session.info.get(_WRITES_INFO_KEY)
+            or session.new
+            or session.dirty
+            or session.deleted
+        )
+    
+    def _evict_on_commit(self, *skus: str) -> None:
+        """Schedule SKUs for eviction from the shared cache when the transaction commits"""
+        self._session.info.setdefault(_EVICT_INFO_KEY, set()).update(skus)
+    
     def _create_model_from_entity(self, product: Product) -> ProductModel:
         """Create database model from domain entity"""
         return ProductModel(
@@ -314,11 +470,11 @@ class SQLAlchemyProductRepository(ProductRepository):
             name=product.name,
             description=product.description,
             sku=product.sku.value,
-            price=float(product.price.amount),
+            price=price_to_minor_units(product.price.amount),
             currency=product.price.currency,
             category_id=product.category_id.value,
             status=product.status,
-            images=product.images.urls if product.images else [],
+            images=self._image_models(product),
             seo_title=product.seo_data.title if product.seo_data else None,
             seo_description=product.seo_data.description if product.seo_data else None,
             seo_keywords=product.seo_data.keywords if product.seo_data else [],
@@ -331,27 +487,71 @@ class SQLAlchemyProductRepository(ProductRepository):
         model.name = product.name
         model.description = product.description
         model.sku = product.sku.value
-        model.price = float(product.price.amount)
+        model.price = price_to_minor_units(product.price.amount)
         model.currency = product.price.currency
         model.category_id = product.category_id.value
         model.status = product.status
-        model.images = product.images.urls if product.images else []
+        model.images = self._image_models(product)
         model.seo_title = product.seo_data.title if product.seo_data else None
         model.seo_description = product.seo_data.description if product.seo_data else None
         model.seo_keywords = product.seo_data.keywords if product.seo_data else []
         model.updated_at = product.timestamps.updated_at
     
-    async def _model_to_entity(self, model: ProductModel) -> Product:
+    @staticmethod
+    def _text_condition(query: str) -> ColumnElement[bool]:
+        """Match products by words of the query, or by a partial SKU"""
+        # Both branches are GIN-indexed: the tsvector column and the SKU trigrams
+        return or_(
+            ProductModel.search_vector.match(query, postgresql_regconfig=SEARCH_CONFIG),
+            ProductModel.sku.ilike(f"%{query}%")
+        )
+    
+    @staticmethod
+    def _keyset_condition(sort_column: Any, descending: bool, after: Tuple[Any, UUID]) -> ColumnElement[bool]:
+        """Rows past the (sort value, id) position in the given sort direction"""
+        sort_value, last_id = after
+        if sort_column is ProductModel.price:
+            sort_value = price_to_minor_units(sort_value)
+        position = tuple_(sort_column, ProductModel.id)
+        boundary = tuple_(literal(sort_value), literal(last_id))
+        return position < boundary if descending else position > boundary
+    
+    @staticmethod
+    def _attribute_condition(attribute_id: Any, value: Any) -> ColumnElement[bool]:
+        """Filter products by one attribute value.
+        
+        A {'min': ..., 'max': ...} mapping is a numeric range; any other value
+        must be contained in the stored JSON value (list values match by element).
+        """
+        match = [ProductAttributeModel.attribute_id == UUID(str(attribute_id))]
+        if isinstance(value, dict) and value.keys() <= {'min', 'max'}:
+            # Inlined so the planner can match the partial numeric index
+            match.append(func.jsonb_typeof(ProductAttributeModel.value) == literal_column("'number'"))
+            if 'min' in value:
+                match.append(ProductAttributeModel.number_value >= value['min'])
+            if 'max' in value:
+                match.append(ProductAttributeModel.number_value <= value['max'])
+        else:
+            match.append(ProductAttributeModel.value.contains(value))
+        return ProductModel.product_attributes.any(and_(*match))
+    
+    @staticmethod
+    def _image_models(product: Product) -> List[ProductImageModel]:
+        """Build image rows for product image URLs in gallery order"""
+        urls = product.images.urls if product.images else []
+        return [ProductImageModel(url=url, sort_order=position) for position, url in enumerate(urls)]
+    
+    def _model_to_entity(self, model: ProductModel) -> Product:
         """Convert database model to domain entity"""
         return Product(
             id=EntityId(model.id),
             name=model.name,
             description=model.description,
             sku=SKU(model.sku),
-            price=Money(amount=model.price, currency=model.currency or "RUB"),
+            price=Money(amount=price_from_minor_units(model.price), currency=model.currency or "RUB"),
             category_id=EntityId(model.category_id),
             status=model.status,
-            images=ProductImages(urls=model.images or []),
+            images=ProductImages(urls=[image.url for image in model.images]),
             seo_data=SEOData(
                 title=model.seo_title,
                 description=model.seo_description,
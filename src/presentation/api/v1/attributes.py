@@ -23,7 +23,7 @@ from ....application.dtos.attribute_dto import (
     AttributeStatsDTO,
     AttributeGroupDTO
 )
-from ....infrastructure.database.connection import get_db_session
+from ....infrastructure.database.connection import get_db_engine, get_db_session
 from ....infrastructure.repositories.attribute_repository import SQLAlchemyAttributeRepository
 from ....infrastructure.repositories.category_repository import SQLAlchemyCategoryRepository
 
@@ -31,9 +31,12 @@ from ....infrastructure.repositories.category_repository import SQLAlchemyCatego
 router = APIRouter(prefix="/attributes", tags=["attributes"])
 
 
-async def get_attribute_use_cases(session=Depends(get_db_session)) -> AttributeUseCases:
+async def get_attribute_use_cases(
+    session=Depends(get_db_session),
+    engine=Depends(get_db_engine)
+) -> AttributeUseCases:
     """Dependency to get AttributeUseCases instance"""
-    attribute_repository = SQLAlchemyAttributeRepository(session)
+    attribute_repository = SQLAlchemyAttributeRepository(session, engine)
     category_repository = SQLAlchemyCategoryRepository(session)
     return AttributeUseCases(attribute_repository, category_repository)
 